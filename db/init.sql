@@ -26,4 +26,11 @@ CREATE TABLE IF NOT EXISTS evaluation_history (
 );
 
 CREATE INDEX IF NOT EXISTS idx_evaluation_history_suite
-    ON evaluation_history(suite_id);
\ No newline at end of file
+    ON evaluation_history(suite_id);
+
+-- History exports read the newest reports first (optionally since a timestamp,
+-- up to a limit): covering index, so they are index-only scans with no sort
+CREATE INDEX IF NOT EXISTS idx_evaluation_history_created_at
+    ON evaluation_history(created_at DESC)
+    INCLUDE (evaluation_id, strategy, test_count, failures_detected,
+             execution_cost, score, duration_ms);
@@ -9,18 +9,27 @@ Usage:
     python experiment.py                              # base mode
     python experiment.py --budget 100                  # budget mode
     python experiment.py --data path/to/data.json      # custom data file
+    python experiment.py --refresh-cache               # re-evaluate, overwrite cache
+    python experiment.py --no-cache                    # bypass the evaluation cache
+    python experiment.py --base-url https://host --http2  # HTTP/2 through an h2 proxy
 
 Assumes the service is running via docker-compose at http://localhost:8000.
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import logging
+import random
+import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Dict, Iterable, Iterator, List, Tuple, TypeVar
 
-import requests
+import httpx
+import ijson
+import orjson
 
 # =============================================================================
 #   Configuration
@@ -28,7 +37,24 @@ import requests
 BASE_URL = "http://localhost:8000"
 DEFAULT_DATA_FILE = "sdc-test-data.json"
 TESTS_PER_SUITE = 10
+MAX_CONCURRENCY = 32
+UPLOAD_BATCH_SIZE = 20
+RETRY_ATTEMPTS = 4
+RETRY_INITIAL_WAIT = 0.2  # seconds, doubled on every attempt
+RETRY_MAX_WAIT = 5.0
 STRATEGIES = ["longest-first", "euclidean-outlier-first", "mahalanobis-outlier-first", "less-safe-first"]
+CACHE_DIR = Path("experiments/.eval_cache")
+SUITES_CACHE_DIR = Path(".cache")
+
+# Captures the strategy (3rd) column of a history row, stops after the third comma
+STRATEGY_RE = re.compile(r"^[^,]*,[^,]*,([^,]*),")
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Evaluation cache policies
+CACHE_ENABLED = "enabled"        # read hits, write misses
+CACHE_WRITE_ONLY = "write-only"  # always call the API, overwrite entries
+CACHE_DISABLED = "disabled"      # never touch the cache
 
 # =============================================================================
 #   Logger
@@ -39,91 +65,190 @@ logging.basicConfig(
 )
 logger = logging.getLogger("experiment")
 
+T = TypeVar("T")
+
 
 # =============================================================================
 #   Data Transformation
 # =============================================================================
-def transform_to_suites(raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def transform_to_suites(docs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     """Transform competition MongoDB documents into API-format suites.
 
     Groups test cases into suites of TESTS_PER_SUITE, assigns
     sequential suite_XX and TC_XXX identifiers, and adds
-    sequenceNumber to road points.
+    sequenceNumber to road points (mutating the documents in place).
+
+    Suites are yielded as soon as they are complete, so callers can start
+    uploading before the whole input has been parsed.
 
     Args:
-        raw_data: List of competition test case documents.
+        docs: Iterable of competition test case documents.
 
-    Returns:
-        List of suite payloads ready for the upload endpoint.
+    Yields:
+        Suite payloads ready for the upload endpoint.
     """
-    suites = []
-    suite_index = 0
     tests_buffer = []
+    n_docs = 0
+    last_test = TESTS_PER_SUITE - 1
+
+    for n_docs, doc in enumerate(docs, start=1):
+        suite_index, test_index = divmod(n_docs - 1, TESTS_PER_SUITE)
+
+        # Add sequenceNumber in place: documents are owned by the caller and
+        # discarded after transformation, so the point dicts are reused
+        road_points = doc["road_points"]
+        for seq, rp in enumerate(road_points):
+            rp["sequenceNumber"] = seq
+
+        tests_buffer.append({"testId": f"TC_{test_index:03d}", "roadPoints": road_points})
 
-    for i, doc in enumerate(raw_data):
-        # Build road points with sequenceNumber
-        road_points = [
-            {"sequenceNumber": seq, "x": rp["x"], "y": rp["y"]}
-            for seq, rp in enumerate(doc["road_points"])
-        ]
-
-        # Assign test ID within current suite
-        test_index = len(tests_buffer)
-        test_case = {
-            "testId": f"TC_{test_index:03d}",
-            "roadPoints": road_points,
-        }
-        tests_buffer.append(test_case)
-
-        # Flush suite when buffer is full or data is exhausted
-        if len(tests_buffer) == TESTS_PER_SUITE or i == len(raw_data) - 1:
-            suite = {
-                "testSuiteId": f"suite_{suite_index:02d}",
-                "tests": tests_buffer,
-            }
-            suites.append(suite)
+        # Flush suite when buffer is full
+        if test_index == last_test:
+            yield {"testSuiteId": f"suite_{suite_index:02d}", "tests": tests_buffer}
             tests_buffer = []
-            suite_index += 1
+
+    # Flush the last, possibly partial, suite once data is exhausted
+    n_suites = -(-n_docs // TESTS_PER_SUITE)
+    if tests_buffer:
+        yield {"testSuiteId": f"suite_{n_suites - 1:02d}", "tests": tests_buffer}
 
     logger.info(
         "Transformed %d test cases into %d suites (%d tests/suite).",
-        len(raw_data), len(suites), TESTS_PER_SUITE,
+        n_docs, n_suites, TESTS_PER_SUITE,
     )
-    return suites
 
 
 # =============================================================================
-#   API Calls
+#   Local Caches
 # =============================================================================
-def upload_suite(suite: Dict[str, Any]) -> bool:
-    """Upload a single test suite. Returns True on success."""
-    suite_id = suite["testSuiteId"]
+def serialize_suite(suite: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Serialize a suite once; the bytes are reused for upload and cache keys."""
+    return suite["testSuiteId"], orjson.dumps(suite)
+
+
+def suite_digest(payload: bytes) -> str:
+    """Return a stable hash of a suite payload, used to invalidate cache entries."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _cache_path(suite_id: str, strategy: str, budget: int | None, digest: str) -> Path:
+    key = hashlib.sha256(f"{suite_id}|{strategy}|{budget}|{digest}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _read_cache(path: Path) -> Any | None:
     try:
-        resp = requests.post(f"{BASE_URL}/v1/test-suite/", json=suite, timeout=30)
-        if resp.status_code == 201:
-            logger.info("Uploaded %s (%d tests).", suite_id, len(suite["tests"]))
-            return True
-        elif resp.status_code == 409:
-            logger.warning("Suite %s already exists, skipping upload.", suite_id)
-            return True  # already there, can still evaluate
-        else:
-            logger.error("Upload %s failed: %d – %s", suite_id, resp.status_code, resp.text)
-            return False
-    except requests.RequestException as exc:
-        logger.error("Upload %s connection error: %s", suite_id, exc)
-        return False
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
 
+def _write_cache(path: Path, data: bytes) -> None:
+    """Write atomically so an interrupted run never leaves a truncated entry."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def suites_cache_path(data_path: Path) -> Path:
+    """Return the cache file for the suites transformed from ``data_path``.
+
+    ``transform_to_suites`` is pure, so its output is keyed by the file
+    content hash and TESTS_PER_SUITE.
+    """
+    with open(data_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return SUITES_CACHE_DIR / f"suites_{digest}_{TESTS_PER_SUITE}.json"
+
+
+# =============================================================================
+#   API Calls
+# =============================================================================
+async def post_with_retry(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    """POST with exponential backoff and jitter on transient failures.
+
+    Connection errors, timeouts and 5xx responses are retried up to
+    RETRY_ATTEMPTS times; 4xx responses are returned immediately. The last
+    5xx response is returned, or the last transport error re-raised.
+    """
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            resp = await client.post(url, **kwargs)
+            if resp.status_code < 500 or attempt == RETRY_ATTEMPTS:
+                return resp
+            reason = f"HTTP {resp.status_code}"
+        except httpx.HTTPError as exc:
+            if attempt == RETRY_ATTEMPTS:
+                raise
+            reason = repr(exc)
+
+        wait = min(RETRY_MAX_WAIT, RETRY_INITIAL_WAIT * 2 ** (attempt - 1))
+        wait += random.uniform(0, wait)
+        logger.warning("POST %s failed (%s), retry %d/%d in %.2fs.",
+                       url, reason, attempt, RETRY_ATTEMPTS - 1, wait)
+        await asyncio.sleep(wait)
+
+
+async def upload_batch(client: httpx.AsyncClient, suites: List[Tuple[str, bytes]]) -> int:
+    """Upload a chunk of pre-serialized suites in one request. Returns the
+    number of suites that are available for evaluation (uploaded or already
+    present)."""
+    first, last = suites[0][0], suites[-1][0]
+    body = b'{"suites":[' + b",".join(payload for _, payload in suites) + b"]}"
+    try:
+        resp = await post_with_retry(client, "/v1/test-suite/batch", content=body, headers=JSON_HEADERS)
+        if resp.status_code != 200:
+            logger.error("Upload %s..%s failed: %d – %s", first, last, resp.status_code, resp.text)
+            return 0
+
+        ok = 0
+        for suite_id, code in orjson.loads(resp.content)["results"].items():
+            if code == 201:
+                logger.info("Uploaded %s.", suite_id)
+                ok += 1
+            elif code == 409:
+                logger.warning("Suite %s already exists, skipping upload.", suite_id)
+                ok += 1  # already there, can still evaluate
+            else:
+                logger.error("Upload %s failed: %d", suite_id, code)
+        return ok
+
+    except httpx.HTTPError as exc:
+        logger.error("Upload %s..%s connection error: %s", first, last, exc)
+        return 0
+
+
+async def evaluate_suite(
+    client: httpx.AsyncClient,
+    suite_id: str,
+    strategy: str,
+    budget: int | None = None,
+    digest: str = "",
+    cache_mode: str = CACHE_ENABLED,
+) -> dict | None:
+    """Evaluate a suite with a given strategy. Returns the report on success.
+
+    Reports are cached on disk keyed by suite, strategy, budget and the
+    suite payload digest; a cache hit skips the HTTP call entirely.
+    """
+    cache_path = _cache_path(suite_id, strategy, budget, digest)
+    if cache_mode == CACHE_ENABLED:
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            logger.info("Cache hit %s | %s → score=%.4f", suite_id, strategy, cached["score"])
+            return cached
 
-def evaluate_suite(suite_id: str, strategy: str, budget: int | None = None) -> dict | None:
-    """Evaluate a suite with a given strategy. Returns True on success."""
     payload = {"testSuiteId": suite_id, "strategy": strategy}
     if budget is not None:
         payload["budget"] = budget
 
     try:
-        resp = requests.post(f"{BASE_URL}/v1/test-suite/evaluation", json=payload, timeout=60)
+        resp = await post_with_retry(
+            client, "/v1/test-suite/evaluation", content=orjson.dumps(payload), headers=JSON_HEADERS,
+        )
         if resp.status_code == 201:
-            report = resp.json()
+            report = orjson.loads(resp.content)
             logger.info(
                 "Evaluated %s | %s → failures=%d cost=%d score=%.4f",
                 suite_id, strategy,
@@ -131,6 +256,8 @@ def evaluate_suite(suite_id: str, strategy: str, budget: int | None = None) -> d
                 report["executionCost"],
                 report["score"],
             )
+            if cache_mode != CACHE_DISABLED:
+                _write_cache(cache_path, orjson.dumps(report))
             return report
         else:
             logger.error(
@@ -138,50 +265,74 @@ def evaluate_suite(suite_id: str, strategy: str, budget: int | None = None) -> d
                 suite_id, strategy, resp.status_code, resp.text,
             )
             return None
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         logger.error("Evaluate %s/%s connection error: %s", suite_id, strategy, exc)
         return None
 
 
-def export_history(data_name: str, strategies: List[str]) -> None:
-    """Download evaluation history CSV, split by strategy, save to experiments/."""
-    try:
-        resp = requests.get(f"{BASE_URL}/v1/history/", timeout=30)
-        if resp.status_code != 200:
-            logger.error("Export failed: %d – %s", resp.status_code, resp.text)
-            return
-
-        # Create output folder
-        output_dir = Path("experiments")
-        output_dir.mkdir(exist_ok=True)
-
-        # Parse CSV
-        lines = resp.text.strip().split("\n")
-        header = lines[0]
-        rows = lines[1:]
-
-        # strategy is the 3rd column (index 2)
-        for strategy in strategies:
-            filtered = [row for row in rows if row.split(",")[2] == strategy]
-            filename = f"evaluation_report_{data_name}_{strategy}.csv"
-            filepath = output_dir / filename
+async def export_history(client: httpx.AsyncClient, data_name: str, strategies: List[str]) -> None:
+    """Download evaluation history CSV, split by strategy, save to experiments/.
 
-            filepath.write_text(header + "\n" + "\n".join(filtered) + "\n")
-            logger.info("Saved %d records to %s", len(filtered), filepath)
+    The response is consumed line by line and each row is dispatched to its
+    strategy file in a single pass, so the full CSV is never held in memory.
+    """
+    output_dir = Path("experiments")
+    writers = {}
+    counts = dict.fromkeys(strategies, 0)
 
-    except requests.RequestException as exc:
+    try:
+        async with client.stream("GET", "/v1/history/") as resp:
+            if resp.status_code != 200:
+                await resp.aread()
+                logger.error("Export failed: %d – %s", resp.status_code, resp.text)
+                return
+
+            # Create output folder
+            output_dir.mkdir(exist_ok=True)
+
+            lines = resp.aiter_lines()
+            header = await anext(lines, None)
+            if header is None:
+                logger.error("Export failed: empty history response.")
+                return
+
+            for strategy in strategies:
+                filepath = output_dir / f"evaluation_report_{data_name}_{strategy}.csv"
+                writers[strategy] = filepath.open("w", buffering=1 << 20)
+                writers[strategy].write(header + "\n")
+
+            async for line in lines:
+                match = STRATEGY_RE.match(line)
+                if match is None:
+                    continue
+                strategy = match.group(1)
+                out = writers.get(strategy)
+                if out is not None:
+                    out.writelines((line, "\n"))
+                    counts[strategy] += 1
+
+        for strategy, out in writers.items():
+            logger.info("Saved %d records to %s", counts[strategy], out.name)
+
+    except httpx.HTTPError as exc:
         logger.error("Export connection error: %s", exc)
 
+    finally:
+        for out in writers.values():
+            out.close()
+
 
 # =============================================================================
 #   Main
 # =============================================================================
-def main():
-    parser = argparse.ArgumentParser(description="SDC Prioritizer Experiment Runner")
-    parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="Path to JSON test data.")
-    parser.add_argument("--budget", type=int, default=None, help="Execution budget (omit for base mode).")
-    args = parser.parse_args()
+async def bounded(sem: asyncio.Semaphore, coro: Awaitable[T]) -> T:
+    """Await ``coro`` while holding ``sem`` to cap in-flight requests."""
+    async with sem:
+        return await coro
 
+
+async def run(args: argparse.Namespace) -> None:
+    """Drive the full experiment over a single keep-alive connection pool."""
     mode = "budget" if args.budget else "base"
     logger.info("=== Experiment started (mode=%s) ===", mode)
 
@@ -191,56 +342,118 @@ def main():
         logger.error("Data file not found: %s", data_path)
         sys.exit(1)
 
-    with open(data_path) as f:
-        raw_data = json.load(f)
-    logger.info("Loaded %d test cases from %s.", len(raw_data), data_path)
-
-    # 2. Transform into suites
-    suites = transform_to_suites(raw_data)
-
-    # 3. Upload all suites
-    logger.info("--- Uploading %d suites ---", len(suites))
-    upload_ok = 0
-    for suite in suites:
-        if upload_suite(suite):
-            upload_ok += 1
-    logger.info("Uploaded %d/%d suites.", upload_ok, len(suites))
-
-    # 4. Evaluate all suites with all strategies
-    logger.info("--- Evaluating with strategies: %s ---", STRATEGIES)
-    eval_ok = 0
-    eval_total = 0
-    scores = {s: [] for s in STRATEGIES}
-
-    for suite in suites:
-        suite_id = suite["testSuiteId"]
-        for strategy in STRATEGIES:
-            eval_total += 1
-            resp = evaluate_suite(suite_id, strategy, args.budget)
+    # 2. Transformed suites are memoized on disk by file content
+    cache_path = suites_cache_path(data_path)
+    cached = _read_cache(cache_path)
+    suites = None
+    if cached is not None:
+        logger.info("Loaded %d suites from cache %s.", len(cached), cache_path)
+        suites = [serialize_suite(suite) for suite in cached]
+
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    # Uvicorn speaks HTTP/1.1 only, so by default every connection of the pool
+    # is kept alive; --http2 multiplexes over one connection behind an h2 proxy
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        http2=args.http2,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENCY,
+            max_keepalive_connections=MAX_CONCURRENCY,
+        ),
+    ) as client:
+
+        # 3. Upload all suites, UPLOAD_BATCH_SIZE per request
+        if suites is not None:
+            logger.info("--- Uploading %d suites ---", len(suites))
+            uploads = [
+                bounded(sem, upload_batch(client, suites[i:i + UPLOAD_BATCH_SIZE]))
+                for i in range(0, len(suites), UPLOAD_BATCH_SIZE)
+            ]
+        else:
+            # Stream-parse the input: each batch is uploaded as soon as it is
+            # transformed, overlapping parsing with in-flight requests
+            logger.info("--- Parsing and uploading suites from %s ---", data_path)
+            suites, uploads = [], []
+            with open(data_path, "rb") as f:
+                docs = ijson.items(f, "item", use_float=True)
+                for suite in transform_to_suites(docs):
+                    suites.append(serialize_suite(suite))
+                    if len(suites) % UPLOAD_BATCH_SIZE == 0:
+                        batch = suites[-UPLOAD_BATCH_SIZE:]
+                        uploads.append(asyncio.create_task(bounded(sem, upload_batch(client, batch))))
+                        await asyncio.sleep(0)  # let pending uploads make progress
+            if len(suites) % UPLOAD_BATCH_SIZE:
+                batch = suites[-(len(suites) % UPLOAD_BATCH_SIZE):]
+                uploads.append(bounded(sem, upload_batch(client, batch)))
+            _write_cache(cache_path, b"[" + b",".join(payload for _, payload in suites) + b"]")
+
+        upload_ok = sum(await asyncio.gather(*uploads))
+        logger.info("Uploaded %d/%d suites.", upload_ok, len(suites))
+
+        # 4. Evaluate all suites with all strategies
+        logger.info("--- Evaluating with strategies: %s ---", STRATEGIES)
+        if args.no_cache:
+            cache_mode = CACHE_DISABLED
+        elif args.refresh_cache:
+            cache_mode = CACHE_WRITE_ONLY
+        else:
+            cache_mode = CACHE_ENABLED
+
+        digests = {suite_id: suite_digest(payload) for suite_id, payload in suites}
+        jobs = [(suite_id, strategy) for suite_id, _ in suites for strategy in STRATEGIES]
+        reports = await asyncio.gather(
+            *(bounded(sem, evaluate_suite(
+                client, suite_id, strategy, args.budget,
+                digest=digests[suite_id], cache_mode=cache_mode,
+            )) for suite_id, strategy in jobs)
+        )
+
+        # 5. Export history in the background while results are summarized;
+        # it only starts now because rows of pending evaluations would be missed
+        logger.info("--- Exporting history ---")
+        data_name = Path(args.data).stem  # "sdc-test-data"
+        export_task = asyncio.create_task(export_history(client, data_name, STRATEGIES))
+        await asyncio.sleep(0)  # get the export request in flight before summarizing
+
+        # gather preserves submission order, so reports line up with jobs
+        eval_ok = 0
+        scores = {s: [] for s in STRATEGIES}
+        for (_, strategy), resp in zip(jobs, reports):
             if resp:
                 eval_ok += 1
                 scores[strategy].append(resp["score"])
-    logger.info("Evaluated %d/%d suite-strategy combinations.", eval_ok, eval_total)
-
-    # Print average scores
-    print("\n" + "=" * 60)
-    print("  EXPERIMENT RESULTS")
-    print("=" * 60)
-    for strategy in STRATEGIES:
-        if scores[strategy]:
-            avg = sum(scores[strategy]) / len(scores[strategy])
-            print(f"  {strategy:<25s}  avg APFD = {avg:.4f}  (n={len(scores[strategy])})")
-        else:
-            print(f"  {strategy:<25s}  no results")
-    print("=" * 60 + "\n")
+        logger.info("Evaluated %d/%d suite-strategy combinations.", eval_ok, len(jobs))
+
+        # Print average scores
+        print("\n" + "=" * 60)
+        print("  EXPERIMENT RESULTS")
+        print("=" * 60)
+        for strategy in STRATEGIES:
+            if scores[strategy]:
+                avg = sum(scores[strategy]) / len(scores[strategy])
+                print(f"  {strategy:<25s}  avg APFD = {avg:.4f}  (n={len(scores[strategy])})")
+            else:
+                print(f"  {strategy:<25s}  no results")
+        print("=" * 60 + "\n")
 
-    # 5. Export history
-    logger.info("--- Exporting history ---")
-    data_name = Path(args.data).stem  # "sdc-test-data"
-    export_history(data_name, STRATEGIES)
+        await export_task
 
     logger.info("=== Experiment complete ===")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="SDC Prioritizer Experiment Runner")
+    parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="Path to JSON test data.")
+    parser.add_argument("--budget", type=int, default=None, help="Execution budget (omit for base mode).")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the evaluation cache.")
+    parser.add_argument("--refresh-cache", action="store_true", help="Re-evaluate everything and overwrite the cache.")
+    parser.add_argument("--base-url", default=BASE_URL, help="Service base URL.")
+    parser.add_argument("--http2", action="store_true", help="Use HTTP/2 (requires httpx[http2] and an h2-capable endpoint).")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
 if __name__ == "__main__":
     main()
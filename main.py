@@ -2,11 +2,12 @@ import importlib.metadata
 import logging
 import os
 from contextlib import asynccontextmanager
-from pathlib import Path
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from pymongo import MongoClient
+from psycopg import Connection
 from psycopg_pool import ConnectionPool
 
 from dotenv import load_dotenv
@@ -19,15 +20,41 @@ from sdc_prioritizer.persistence.postgres_repository import PostgresTestSuiteRep
 from sdc_prioritizer.routers import test_suite_router, history_router
 
 from fastapi.exceptions import RequestValidationError
-from sdc_prioritizer.utils.error_handlers import validation_exception_handler
+from sdc_prioritizer.utils.error_handlers import (
+    already_exists_exception_handler,
+    not_found_exception_handler,
+    persistence_exception_handler,
+    strategy_not_found_exception_handler,
+    unexpected_exception_handler,
+    validation_exception_handler,
+)
+from sdc_prioritizer.utils.exceptions import (
+    PersistenceError,
+    StrategyNotFoundError,
+    TestSuiteAlreadyExistsError,
+    TestSuiteNotFoundError,
+)
 
 # ======================================================================================================================
 #   Global Variables
 # ======================================================================================================================
 # setup logging
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 load_dotenv()
 
+# =============================================================================
+#   PostgreSQL connection setup
+# =============================================================================
+def configure_pg_connection(conn: Connection) -> None:
+    """Session settings applied once to every new pooled connection.
+
+    The service only runs short, index-backed statements, for which JIT
+    compilation costs more than it saves.
+    """
+    conn.execute("SET jit = off")
+    conn.commit()  # a configured connection must be returned idle to the pool
+
+
 # =============================================================================
 #   Lifespan – open and close DB connections around the app's lifetime
 # =============================================================================
@@ -49,8 +76,11 @@ async def lifespan(app: FastAPI):
         conninfo=postgres_uri,
         min_size=configuration.postgresql.pool_min_size,
         max_size=configuration.postgresql.pool_max_size,
+        kwargs={"application_name": "sdc-prioritizer"},
+        configure=configure_pg_connection,
         open=True,
     )
+    pg_pool.wait(timeout=30.0)  # pre-open min_size connections: first requests skip the connect
 
     # Wire up repositories and service, attach to app state
     mongo_repo   = MongoTestCaseRepository(
@@ -58,7 +88,11 @@ async def lifespan(app: FastAPI):
         database=configuration.mongodb.database,
         collection=configuration.mongodb.collection_test_cases,
     )
-    postgres_repo = PostgresTestSuiteRepository(pool=pg_pool)
+    postgres_repo = PostgresTestSuiteRepository(
+        pool=pg_pool,
+        flush_batch=configuration.postgresql.eval_flush_batch,
+        flush_interval=configuration.postgresql.eval_flush_interval_ms / 1000,
+    )
 
     app.state.test_suite_service = TestSuiteService(
         mongo_repo=mongo_repo,
@@ -71,6 +105,7 @@ async def lifespan(app: FastAPI):
     # Teardown
     logger.info("Shutting down – closing DB connections.")
     mongo_client.close()
+    postgres_repo.close()  # flush queued evaluations while the pool is open
     pg_pool.close()
     logger.info("Application shutdown complete.")
 
@@ -86,10 +121,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# CSV exports and long orderedTests lists compress well; streamed responses are
+# compressed chunk by chunk, small ones are sent as they are
+app.add_middleware(GZipMiddleware, minimum_size=configuration.server.gzip_min_size)
+
 app.include_router(test_suite_router)
 app.include_router(history_router)
 
+# Routes let errors propagate; each one is answered here with its ErrorResponse
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.add_exception_handler(TestSuiteAlreadyExistsError, already_exists_exception_handler)
+app.add_exception_handler(TestSuiteNotFoundError, not_found_exception_handler)
+app.add_exception_handler(StrategyNotFoundError, strategy_not_found_exception_handler)
+app.add_exception_handler(PersistenceError, persistence_exception_handler)
+app.add_exception_handler(Exception, unexpected_exception_handler)
 
 
 # =============================================================================
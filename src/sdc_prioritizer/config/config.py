@@ -45,6 +45,7 @@ class ServerConfig(BaseModel):
 
     host: str
     port: int = Field(gt=0, le=65535)
+    gzip_min_size: int = Field(default=1024, ge=0)
 
     @field_validator("host")
     def check_host(cls, v: str) -> str:
@@ -80,6 +81,8 @@ class PostgreSQLConfig(BaseModel):
 
     pool_min_size: int = Field(ge=1)
     pool_max_size: int = Field(ge=1)
+    eval_flush_batch: int = Field(default=500, ge=1)
+    eval_flush_interval_ms: int = Field(default=100, ge=1)
 
 
 # =============================================================================
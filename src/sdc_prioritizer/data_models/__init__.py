@@ -1,9 +1,11 @@
-from sdc_prioritizer.data_models.error_responses import ErrorResponse
+from sdc_prioritizer.data_models.error_responses import ErrorResponse, error_content
 from sdc_prioritizer.data_models.api_models import (
     RoadPoint,
     TestCase,
     UploadTestSuiteRequest,
     UploadTestSuiteResponse,
+    BatchUploadTestSuiteRequest,
+    BatchUploadTestSuiteResponse,
     PrioritizeResponse,
     EvaluateRequest,
     EvaluateResponse
@@ -11,10 +13,13 @@ from sdc_prioritizer.data_models.api_models import (
 
 __all__ = [
     "ErrorResponse",
+    "error_content",
     "RoadPoint",
     "TestCase",
     "UploadTestSuiteRequest",
     "UploadTestSuiteResponse",
+    "BatchUploadTestSuiteRequest",
+    "BatchUploadTestSuiteResponse",
     "PrioritizeResponse",
     "EvaluateRequest",
     "EvaluateResponse"
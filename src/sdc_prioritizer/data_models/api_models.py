@@ -1,8 +1,15 @@
+from collections import Counter
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, Field, field_validator
 
+# =============================================================================
+#   ID Patterns – specified in pdf, compiled once by pydantic-core
+# =============================================================================
+TEST_ID_PATTERN = r"^TC_\d{3}$"      # TC_XXX
+SUITE_ID_PATTERN = r"^suite_\d{2}$"  # suite_XX
+
 
 # =============================================================================
 #   Primitives
@@ -17,7 +24,7 @@ class RoadPoint(BaseModel):
 class TestCase(BaseModel):
     """A single SDC test case as provided by the caller."""
 
-    testId: str = Field(pattern=r"^TC_\d{3}$", # Pattern specified in pdf: TC_XXX
+    testId: str = Field(pattern=TEST_ID_PATTERN,
                         description="Test ID in format TC_XXX")
     roadPoints: List[RoadPoint] = Field(min_length=1, description="Ordered road points.")
 
@@ -52,7 +59,7 @@ class UploadTestSuiteRequest(BaseModel):
             required. At least one test case is required in the body of requests.
     """
 
-    testSuiteId: str = Field(pattern=r"^suite_\d{2}$", # Pattern specified in pdf: suite_XX
+    testSuiteId: str = Field(pattern=SUITE_ID_PATTERN,
                              description="Suite ID in format suite_XX")
     tests: List[TestCase] = Field(min_length=1, description="At least one test case required.")
 
@@ -60,7 +67,7 @@ class UploadTestSuiteRequest(BaseModel):
     def test_ids_must_be_unique(cls, v: List[TestCase]) -> List[TestCase]:
         ids = [tc.testId for tc in v]
         if len(ids) != len(set(ids)):
-            duplicates = {i for i in ids if ids.count(i) > 1}
+            duplicates = {i for i, count in Counter(ids).items() if count > 1}
             # check for duplicate before calling persistance layer
             raise ValueError(f"Duplicate testIds found within the suite: {duplicates}")
         return v
@@ -178,6 +185,26 @@ class UploadTestSuiteResponse(BaseModel):
     createdAt: datetime
     message: str = "Test suite uploaded successfully."
 
+
+# =============================================================================
+#   Request - Endpoint 1 Batch Upload
+# =============================================================================
+class BatchUploadTestSuiteRequest(BaseModel):
+    """Request body for uploading several test suites in a single call."""
+
+    suites: List[UploadTestSuiteRequest] = Field(min_length=1, description="At least one test suite required.")
+
+
+# =============================================================================
+#   Response - Endpoint 1 Batch Upload
+# =============================================================================
+class BatchUploadTestSuiteResponse(BaseModel):
+    """Per-suite outcome of a batch upload, as HTTP status codes that the
+    single-suite endpoint would have returned (201, 409 or 500)."""
+
+    results: Dict[str, int]
+    uploaded: int
+
 # =============================================================================
 #   Response - Endpoint 2 Prioritize (GET — no request body needed)
 # =============================================================================
@@ -202,7 +229,7 @@ class EvaluateRequest(BaseModel):
     """
 
     testSuiteId: str = Field(
-        pattern=r"^suite_\d{2}$",
+        pattern=SUITE_ID_PATTERN,
         description="Suite ID in format suite_XX",
     )
     strategy: str = Field(
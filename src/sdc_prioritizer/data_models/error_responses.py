@@ -1,7 +1,23 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
+# Documents the error bodies in the OpenAPI schema; the handlers build the
+# bodies themselves with error_content
 class ErrorResponse(BaseModel):
     """Standard error response envelope."""
 
     message: str
+    details: Optional[List[str]] = None
+
+
+def error_content(message: str, details: Optional[List[str]] = None) -> dict:
+    """Return an ErrorResponse body as a plain dict, without building the model.
+
+    ``details`` is only included when there are some, as ErrorResponse leaves
+    it out by default.
+    """
+    if details:
+        return {"message": message, "details": details}
+    return {"message": message}
@@ -8,20 +8,26 @@ be compliant with the competition gRPC evaluator.
 
 import math
 import logging
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from sdc_prioritizer.domain.strategies import TestCaseData
 
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
 #   Mock Failure Function
 # =============================================================================
+MAX_ANGLE = math.pi / 45  # 4 gradi
+_COS_MAX_ANGLE = math.cos(MAX_ANGLE)  # acos is decreasing: angle > max ⇔ cos < cos(max)
+_MOCK_CHUNK = 512  # interior points checked per vectorized step
+
+
 def mock_has_failed(tc: TestCaseData, max_points: int | None = None) -> (bool, int):
     """
     Determines if a test case has failed based on the angular displacement between consecutive road points.
@@ -30,9 +36,13 @@ def mock_has_failed(tc: TestCaseData, max_points: int | None = None) -> (bool, i
     that may indicate a failure. The analysis stops as soon as a failure is detected or when the evaluation
     reaches the predefined maximum point limit (as requested by assignment).
 
+    Turning angles are evaluated on the road point array in windows of up to 512 interior points:
+    the first point whose cosine falls below cos(max_angle) is the failure point, so no acos, clamp
+    or division is needed, and the remaining windows are skipped.
+
     Args:
-        tc (TestCaseData): A test case containing a list of road points to analyze. Each point is represented
-            as a tuple containing x and y coordinates (e.g., (x, y)).
+        tc (TestCaseData): A test case containing the road points to analyze, as an (n, 2) array of
+            x and y coordinates.
         max_points (int | None, optional): The maximum number of points to evaluate. If None, all points in
             the test case are analyzed. Defaults to None.
 
@@ -41,45 +51,83 @@ def mock_has_failed(tc: TestCaseData, max_points: int | None = None) -> (bool, i
         failure occurred, False otherwise) and the second element contains the number of points evaluated
         before the function returned.
     """
-    if len(tc.road_points) < 3:
+    n = len(tc.road_points)
+    if n < 3:
         # Assumption: at least 3 points per test are evaluated to perform mock
-        return False, len(tc.road_points)
-
-    max_angle = math.pi / 45 # 4 gradi
-    pts = tc.road_points
+        return False, n
 
     # Budget caps how many points we can evaluate:
-    limit = len(pts) if max_points is None else min(len(pts), max_points)
+    limit = n if max_points is None else min(n, max_points)
 
-    # For till happens failure, or reach the limits exit means limit or False
-    for i in range(1, limit - 1):
-        # Vectors computation of two consecutive displacements:
-        dx1 = pts[i][0] - pts[i - 1][0]
-        dy1 = pts[i][1] - pts[i - 1][1]
-        dx2 = pts[i + 1][0] - pts[i][0]
-        dy2 = pts[i + 1][1] - pts[i][1]
+    # Windows of _MOCK_CHUNK interior points (+2 neighbours) keep the early exit
+    # on very long roads; typical roads fit in a single window.
+    for start in range(0, limit - 2, _MOCK_CHUNK):
+        stop = min(start + _MOCK_CHUNK + 1, limit - 1)
 
-        # Vectors modules:
-        len1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
-        len2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
+        # Vectors of consecutive displacements and their modules, shared with the strategies:
+        d = tc.diffs[start:stop]
+        seg_len = tc.seg_lens[start:stop]
 
-        # No displacement occurs:
-        if len1 == 0 or len2 == 0:
-            continue
+        # Angle at interior point k + 1 is between displacements d[k] and d[k + 1]:
+        dot = (d[:-1] * d[1:]).sum(axis=1)
+        len_prod = seg_len[:-1] * seg_len[1:]
 
-        cross_product = dx1 * dx2 + dy1 * dy2
-        cos_angle = cross_product / (len1 * len2)
+        # cos_angle < cos(max) rewritten as dot < cos(max) * |d1| * |d2|: no division
+        # or clamp needed, and a zero displacement gives 0 < 0 so the point is skipped.
+        sharp = dot < _COS_MAX_ANGLE * len_prod
+        k = int(np.argmax(sharp))  # first sharp turn, 0 if none
+        if sharp[k]:
+            # OBB return at the first sharp turn: interior point start + k + 1, stopping point + x0
+            return True, start + k + 2
 
-        # Boundaries for acos compatibility:
-        cos_angle = max(-1.0, min(1.0, cos_angle))
-        angle = math.acos(cos_angle)
+    return False, limit
 
-        # OBB return without computing all points
-        if angle > max_angle:
-            # returned true, stopping point + x0
-            return True, i+1
 
-    return False, limit
+def mock_has_failed_batch(test_cases: List[TestCaseData]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs the mock failure function without a point limit on a whole list of test cases at once.
+
+    The road points of all test cases are concatenated and every turning angle is tested in a single
+    NumPy pass; the first sharp turn of each road is then picked with ``np.unique``. For each test
+    case the result equals ``mock_has_failed(tc)``.
+
+    Args:
+        test_cases (List[TestCaseData]): The test cases to simulate, in any order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: A boolean array telling which test cases failed and an int64
+        array with the number of points each one evaluated, both aligned with ``test_cases``.
+    """
+    counts = np.fromiter((len(tc.road_points) for tc in test_cases), dtype=np.int64, count=len(test_cases))
+    failed = np.zeros(len(test_cases), dtype=np.bool_)
+    costs = counts.copy()  # a test that does not fail evaluates all its points
+
+    long_roads = np.flatnonzero(counts >= 3)
+    if long_roads.size == 0:
+        return failed, costs
+
+    # One point array for all roads; displacements across two roads are masked out below
+    pts = np.concatenate([test_cases[i].road_points for i in long_roads])
+    point_counts = counts[long_roads]
+    owner = np.repeat(np.arange(long_roads.size), point_counts)
+    first_point = np.repeat(np.cumsum(point_counts) - point_counts, point_counts)
+
+    d = pts[1:] - pts[:-1]
+    seg_len = np.linalg.norm(d, axis=1)
+
+    # Same comparison as the scalar path; angle j sits at point j + 1, between d[j] and d[j + 1]
+    dot = (d[:-1] * d[1:]).sum(axis=1)
+    len_prod = seg_len[:-1] * seg_len[1:]
+    sharp = (owner[:-2] == owner[2:]) & (dot < _COS_MAX_ANGLE * len_prod)
+
+    # First sharp turn of each road: stopping at point j + 1 evaluates it and all before it
+    hits = np.flatnonzero(sharp)
+    owners, first = np.unique(owner[hits], return_index=True)
+    rows = long_roads[owners]
+    failed[rows] = True
+    costs[rows] = hits[first] - first_point[hits[first]] + 2
+
+    return failed, costs
 
 
 
@@ -110,16 +158,17 @@ def compute_apfd(
             better fault detection performance.
     """
     n = len(ordered_ids)
-    fault_positions = []
+    flags = np.fromiter(
+        (failure_map.get(test_id, False) for test_id in ordered_ids),
+        dtype=np.bool_, count=n,
+    )
 
-    # Append in order all the index of Faulty tests
-    for i, test_id in enumerate(ordered_ids):
-        if failure_map.get(test_id, False):
-            fault_positions.append(i + 1)
+    # 1-based positions in order of all the Faulty tests
+    fault_positions = np.flatnonzero(flags) + 1
 
-    m = len(fault_positions)
+    m = fault_positions.size
 
     if n == 0 or m == 0:
         return 1.0
 
-    return 1 - (sum(fault_positions) / (n * m)) + 1 / (2 * n)
\ No newline at end of file
+    return 1 - (int(fault_positions.sum()) / (n * m)) + 1 / (2 * n)
\ No newline at end of file
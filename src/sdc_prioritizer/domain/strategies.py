@@ -5,7 +5,8 @@ can be added without modifying existing code (Open/Closed Principle).
 
 How to add a new strategy:
     1. Create a class that inherits base class from ``PrioritizationStrategy``.
-    2. Implement the ``prioritize`` method.
+    2. Implement the ``prioritize`` method (strategies that sort by index can
+        implement ``order`` instead, see ``_IndexOrderStrategy``).
     3. Register it in ``STRATEGY_REGISTRY`` with a kebab-case key (e.g.
         ``"my-strategy"``).
 
@@ -20,21 +21,21 @@ Architecture note:
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from pathlib import Path
+from functools import cached_property
 from typing import Dict, List, Tuple, Type
-import math
+from weakref import WeakKeyDictionary
 import numpy as np
 from sdc_prioritizer.utils.exceptions import StrategyNotFoundError
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
 #   Domain Object – transport-agnostic test case representation
 # =============================================================================
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class TestCaseData:
     """
     Transport-agnostic domain object carrying raw road points for possible
@@ -44,15 +45,40 @@ class TestCaseData:
     This keeps strategies self-contained and allows new ones to be added
     without modifying persistence or upload logic to meet Open/Closed
     Principle.
+
+    Road points are held as one contiguous (n, 2) float64 array: any sequence
+    of (x, y) pairs passed in is converted once at construction. Equality and
+    hashing are by identity, since arrays have no single truth value.
+
+    Displacements and segment lengths are derived lazily and kept on the
+    instance, so strategies and the mock evaluation share one computation.
     """
     test_id: str
-    road_points: List[Tuple[float, float]]  # ordered (x, y) pairs
+    road_points: np.ndarray  # ordered (x, y) rows, shape (n, 2)
+
+    def __post_init__(self) -> None:
+        points = np.asarray(self.road_points, dtype=np.float64).reshape(-1, 2)
+        object.__setattr__(self, "road_points", points)
+
+    def as_tuples(self) -> List[Tuple[float, float]]:
+        """Road points as a list of (x, y) tuples, for callers expecting pairs."""
+        return [tuple(p) for p in self.road_points.tolist()]
+
+    @cached_property
+    def diffs(self) -> np.ndarray:
+        """Consecutive displacements ``road_points[i + 1] - road_points[i]``, shape (n - 1, 2)."""
+        return self.road_points[1:] - self.road_points[:-1]
+
+    @cached_property
+    def seg_lens(self) -> np.ndarray:
+        """Length of each displacement in ``diffs``, shape (n - 1,)."""
+        return np.linalg.norm(self.diffs, axis=1)
 
 # =============================================================================
 #   Preparation Functions – Cross methods among strategies
 # =============================================================================
 
-def _simplify_by_inflection(pts: List[Tuple[float, float]]) -> List[int]:
+def _simplify_by_inflection(d: np.ndarray) -> np.ndarray:
     """Find inflection points where road curvature changes sign.
 
     Right-hand rule:
@@ -61,70 +87,157 @@ def _simplify_by_inflection(pts: List[Tuple[float, float]]) -> List[int]:
 
     Uses the signed cross product of consecutive displacement vectors.
 
-    A sign change marks a vertex of the simplified polyline.
+    A sign change marks a vertex of the simplified polyline. Straight
+    stretches (null cross product) carry the previous turn direction, so the
+    signs are compared between consecutive non-zero crosses only.
 
     Args:
-        pts: Road points as (x, y) tuples.
+        d: Consecutive displacements of the road points, an (n - 1, 2) array.
 
     Returns:
         Indices of inflection points (including start and end).
     """
-    n = len(pts)
+    n = len(d) + 1
     if n < 3:
-        return list(range(n))
-
-    vertices = [0]
-
-    # Initial turn direction
-    prev_cross = (
-        (pts[1][0] - pts[0][0]) * (pts[2][1] - pts[1][1])
-        - (pts[1][1] - pts[0][1]) * (pts[2][0] - pts[1][0])
-    )
-
-    for i in range(1, n - 1):
-        cross = (
-            (pts[i][0] - pts[i - 1][0]) * (pts[i + 1][1] - pts[i][1])
-            - (pts[i][1] - pts[i - 1][1]) * (pts[i + 1][0] - pts[i][0])
-        )
-
-        if cross == 0:
-            continue
+        return np.arange(n)
 
-        # Sign change → inflection point
-        if prev_cross != 0 and (cross > 0) != (prev_cross > 0):
-            vertices.append(i)
+    # Cross product at interior point i is between displacements d[i-1] and d[i]:
+    cross = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
 
-        prev_cross = cross
+    # Sign change → inflection point
+    turning = np.flatnonzero(cross != 0)
+    change = np.flatnonzero(np.diff(np.sign(cross[turning])) != 0)
+    inner = turning[change + 1] + 1
 
-    vertices.append(n - 1)
-    return vertices
+    return np.concatenate(([0], inner, [n - 1]))
 
-def _shoelace_area(points: List[Tuple[float, float]]) -> float:
-    """Compute polygon area via Shoelace formula
+def _shoelace_areas(pts: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """Compute polygon areas via Shoelace formula
         Ref: https://en.wikipedia.org/wiki/Shoelace_formula.
 
     Used to measure the deviation between the actual road curve
     and the simplified straight-line segment:
         Ref: https://doi.org/10.48550/arXiv.2111.04666
 
+    Polygon k is the road stretch ``pts[vertices[k]:vertices[k + 1] + 1]``
+    closed by its chord. Consecutive polygons share their edges with the road,
+    so the 2x2 determinants of all road edges are computed once and summed per
+    polygon with a single ``np.add.reduceat``; only the closing chords are
+    added on top.
+
     Args:
-        points: Polygon vertices in order (auto-closed).
+        pts: Road points as an (n, 2) array.
+        vertices: Strictly increasing polyline vertex indices, from 0 to n - 1.
 
     Returns:
-        Absolute area of the polygon.
+        Absolute area of each polygon, 0.0 for stretches of fewer than 3 points.
     """
-    n = len(points)
-    if n < 3:
-        return 0.0
+    x, y = pts[:, 0], pts[:, 1]
+    start = vertices[:-1]
+    end = vertices[1:]
+
+    # 2x2 Determinants computation over 2D-coordinates, one per road edge:
+    cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+    area = np.add.reduceat(cross, start) + (x[end] * y[start] - x[start] * y[end])
+
+    return np.where(end - start >= 2, np.abs(area) / 2.0, 0.0)
+
+def _road_safety(tc: TestCaseData) -> Tuple[float, float]:
+    """Total and mean area between the road curve and its simplified polyline.
+
+    Args:
+        tc: Test case whose road is measured.
+
+    Returns:
+        (safety_sum, safety_mean), both 0.0 for roads with fewer than 3 points.
+    """
+    if len(tc.road_points) < 3:
+        return 0.0, 0.0
+
+    areas = _shoelace_areas(tc.road_points, _simplify_by_inflection(tc.diffs))
+    safety_sum = float(areas.sum())
+    safety_mean = safety_sum / len(areas)
+    return safety_sum, safety_mean
+
+
+def _extract_features_batch(test_cases: List[TestCaseData]) -> np.ndarray:
+    """Extract the ``extract_features`` vector of every test case at once.
+
+    The cached displacements of all roads are concatenated into one array and
+    each segment and angle is tagged with the index of the test it belongs to;
+    per-test sums, maxima and counts are then segment reductions over those
+    tags, so the geometry features of a whole suite cost a handful of NumPy
+    calls.
+
+    Args:
+        test_cases: Test cases with at least one road point each.
+
+    Returns:
+        (N, 8) feature matrix, one row per test case in input order.
+    """
+    n_tests = len(test_cases)
+    lens = np.fromiter((len(tc.road_points) for tc in test_cases), dtype=np.int64, count=n_tests)
+    ends = np.cumsum(lens)
+    pts = np.concatenate([tc.road_points for tc in test_cases])
+    d = np.concatenate([tc.diffs for tc in test_cases])
+    seg_owner = np.repeat(np.arange(n_tests), lens - 1)
+
+    # F1: Direct distance (start to finish)
+    direct_dist = np.linalg.norm(pts[ends - 1] - pts[ends - lens], axis=1)
+
+    # F2: Road distance
+    seg_len = np.linalg.norm(d, axis=1)  # reused by the angle features below
+    road_dist = np.bincount(seg_owner, weights=seg_len, minlength=n_tests)
+
+    # Angles at each interior point, 0.0 where a displacement is null;
+    # consecutive segments of two different tests form no angle
+    ang_valid = seg_owner[:-1] == seg_owner[1:]
+    dot = (d[:-1] * d[1:]).sum(axis=1)[ang_valid]
+    len_prod = (seg_len[:-1] * seg_len[1:])[ang_valid]
+    moving = len_prod != 0
+    cos_a = np.clip(dot / np.where(moving, len_prod, 1.0), -1.0, 1.0)
+    angles = np.where(moving, np.arccos(cos_a), 0.0)
+    ang_owner = seg_owner[:-1][ang_valid]
+
+    counts = np.bincount(ang_owner, minlength=n_tests)
+    total_angle = np.bincount(ang_owner, weights=angles, minlength=n_tests)
+    max_angle = np.zeros(n_tests)
+    np.maximum.at(max_angle, ang_owner, angles)
+    safe_counts = np.maximum(counts, 1)
+    mean_angle = total_angle / safe_counts
+    dev = angles - mean_angle[ang_owner]
+    std_angle = np.sqrt(np.bincount(ang_owner, weights=dev * dev, minlength=n_tests) / safe_counts)
+
+    # F14, F15: Road Safety — area between road curve and simplified polyline
+    safety = np.array([_road_safety(tc) for tc in test_cases]).reshape(n_tests, 2)
+
+    return np.column_stack([
+        direct_dist, road_dist, total_angle, max_angle,
+        mean_angle, std_angle, safety[:, 0], safety[:, 1],
+    ])
 
-    area = 0.0
-    for i in range(n):
-        j = (i + 1) % n
-        # 2x2 Determinants computation over 2D-coordinates:
-        area += points[i][0] * points[j][1]
-        area -= points[j][0] * points[i][1]
 
-    return abs(area) / 2.0
+# Feature rows of test cases already seen, shared by every strategy. Keyed by
+# the TestCaseData object itself (test ids repeat across suites) and dropped
+# with it, so a suite reused across strategies is only measured once.
+_FEATURE_CACHE: "WeakKeyDictionary[TestCaseData, np.ndarray]" = WeakKeyDictionary()
+
+
+def _features_for(test_cases: List[TestCaseData]) -> np.ndarray:
+    """Feature matrix of ``test_cases``, computing only rows not yet cached.
+
+    Args:
+        test_cases: Test cases with at least one road point each.
+
+    Returns:
+        (N, 8) feature matrix, one row per test case in input order.
+    """
+    missing = [tc for tc in test_cases if tc not in _FEATURE_CACHE]
+    if missing:
+        for tc, row in zip(missing, _extract_features_batch(missing)):
+            _FEATURE_CACHE[tc] = row
+    return np.array([_FEATURE_CACHE[tc] for tc in test_cases]).reshape(-1, 8)
+
 
 def extract_features(tc: TestCaseData, divide_pi: int = 18) -> List[float]:
     """Extract road geometry features from a test case.
@@ -142,68 +255,7 @@ def extract_features(tc: TestCaseData, divide_pi: int = 18) -> List[float]:
     Returns:
         Feature vector [F1, F2, F6, F9, F11, F8, F14, F15]
     """
-    pts = tc.road_points
-    n = len(pts)
-
-    # F1: Direct distance (start to finish)
-    direct_dist = math.sqrt(
-        (pts[-1][0] - pts[0][0]) ** 2 + (pts[-1][1] - pts[0][1]) ** 2
-    )
-
-    # F2: Road distance (total segment length)
-    road_dist = 0.0
-    for i in range(1, n):
-        dx = pts[i][0] - pts[i - 1][0]
-        dy = pts[i][1] - pts[i - 1][1]
-        road_dist += math.sqrt(dx * dx + dy * dy)
-
-    # Angles at each interior point
-    angles = []
-    for i in range(1, n - 1):
-        dx1 = pts[i][0] - pts[i - 1][0]
-        dy1 = pts[i][1] - pts[i - 1][1]
-        dx2 = pts[i + 1][0] - pts[i][0]
-        dy2 = pts[i + 1][1] - pts[i][1]
-
-        len1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
-        len2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
-
-        if len1 == 0 or len2 == 0:
-            angles.append(0.0)
-            continue
-
-        dot = dx1 * dx2 + dy1 * dy2
-        cos_a = max(-1.0, min(1.0, dot / (len1 * len2)))
-        angles.append(math.acos(cos_a))
-
-    if not angles:
-        total_angle = max_angle = mean_angle = std_angle = 0.0
-    else:
-        total_angle = sum(angles)
-        max_angle = max(angles)
-        mean_angle = total_angle / len(angles)
-        variance = sum((a - mean_angle) ** 2 for a in angles) / len(angles)
-        std_angle = math.sqrt(variance)
-
-    # F14, F15: Road Safety — area between road curve and simplified polyline
-    safety_sum = 0.0
-    safety_mean = 0.0
-    if n >= 3:
-        vertices = _simplify_by_inflection(pts)
-        areas = []
-        for i in range(len(vertices) - 1):
-            polygon_pts = [pts[j] for j in range(vertices[i], vertices[i + 1] + 1)]
-            if len(polygon_pts) >= 3:
-                areas.append(_shoelace_area(polygon_pts))
-            else:
-                areas.append(0.0)
-        safety_sum = sum(areas)
-        safety_mean = safety_sum / len(areas) if areas else 0.0
-
-    return [
-        direct_dist, road_dist, total_angle, max_angle,
-        mean_angle, std_angle, safety_sum, safety_mean,
-    ]
+    return _features_for([tc])[0].tolist()
 
 # =============================================================================
 #   Strategy Base Class – Abstract Base Class for validation
@@ -223,11 +275,42 @@ class PrioritizationStrategy(ABC):
             List of ``test_id`` strings in prioritized order.
         """
 
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        """Return the positions of ``test_cases`` in prioritized order.
+
+        Lets callers walk the test cases themselves instead of looking every
+        returned ``test_id`` up again. The default maps ``prioritize`` back
+        to positions; strategies that sort by index override it.
+
+        Args:
+            test_cases: Unordered collection of test case metrics.
+
+        Returns:
+            Integer array of indices into ``test_cases``.
+        """
+        position = {tc.test_id: i for i, tc in enumerate(test_cases)}
+        return np.fromiter(
+            (position[test_id] for test_id in self.prioritize(test_cases)),
+            dtype=np.intp, count=len(test_cases),
+        )
+
+
+class _IndexOrderStrategy(PrioritizationStrategy):
+    """Base for strategies that rank test cases by position: subclasses
+    implement ``order`` and ``prioritize`` maps it to test IDs."""
+
+    @abstractmethod
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        ...
+
+    def prioritize(self, test_cases: List[TestCaseData]) -> List[str]:
+        return [test_cases[i].test_id for i in self.order(test_cases).tolist()]
+
 
 # =============================================================================
 #   Strategies Logic - My Strategies
 # =============================================================================
-class OutlierSortStrategy(PrioritizationStrategy):
+class OutlierSortStrategy(_IndexOrderStrategy):
     """Sort tests by distance from mean in feature space — most anomalous first.
 
     Supports two distance metrics:
@@ -241,8 +324,8 @@ class OutlierSortStrategy(PrioritizationStrategy):
     def __init__(self, method: str = "euclidean") -> None:
         self._method = method
 
-    def prioritize(self, test_cases: List[TestCaseData]) -> List[str]:
-        features = np.array([extract_features(tc) for tc in test_cases])
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        features = _features_for(test_cases)
         n, d = features.shape
         mean = features.mean(axis=0) # mean over all tests
         diffs = features - mean
@@ -250,86 +333,83 @@ class OutlierSortStrategy(PrioritizationStrategy):
         if self._method == "euclidean":
             stds = features.std(axis=0) # std over all tests
             stds[stds == 0] = 1.0 # clip
-            z_scores = diffs / stds
-            distances = np.sqrt(np.sum(z_scores ** 2, axis=1))
+            distances = np.linalg.norm(diffs / stds, axis=1)  # z-scores from origin
 
         elif self._method == "mahalanobis":
             cov = np.cov(features, rowvar=False)
             # Regularize for numerical stability (small sample / correlated features)
             reg = 1e-6 * np.eye(d)
-            cov_inv = np.linalg.inv(cov + reg)
-            distances = np.sqrt(np.sum(diffs @ cov_inv * diffs, axis=1))
+            try:
+                # cov = L @ L.T, so diff.T @ cov^-1 @ diff = |L^-1 @ diff|^2
+                chol = np.linalg.cholesky(cov + reg)
+                y = np.linalg.solve(chol, diffs.T)
+                distances = np.linalg.norm(y, axis=0)
+            except np.linalg.LinAlgError:
+                # Not positive definite in floating point: explicit inverse
+                logger.debug("Covariance not positive definite, using inverse.")
+                cov_inv = np.linalg.inv(cov + reg)
+                distances = np.sqrt(np.einsum("ij,ij->i", diffs @ cov_inv, diffs))
 
         else:
             raise ValueError(f"Unknown method: {self._method}")
 
-        order = np.argsort(-distances)
-        return [test_cases[i].test_id for i in order]
+        return np.argsort(-distances)
 
 
-class LessSafeStrategy(PrioritizationStrategy):
+class LessSafeStrategy(_IndexOrderStrategy):
     """Sort tests by safety sum value, the intuition is that tests with less
     area between road and simplified polyline are more likely to fail.
 
+    Roads shorter than 3 points have no area and score 0.0.
+
+    With ``proxy=True`` the inflection polyline is skipped: tests are ranked
+    by the sum of absolute cross products of consecutive displacements (twice
+    the area of the triangles swept at each turn), a cheap stand-in for the
+    safety sum that grows with the same sharp, long turns.
     """
-    def prioritize(self, test_cases: List[TestCaseData]) -> List[str]:
-        safety_sums = []
 
-        for tc in test_cases:
-            pts = tc.road_points
-            n = len(pts)
+    def __init__(self, proxy: bool = False) -> None:
+        self._proxy = proxy
 
-            if n >= 3:
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        if self._proxy:
+            safety_sums = np.array([self._turn_area(tc.diffs) for tc in test_cases])
+        else:
+            safety_sums = _features_for(test_cases)[:, 6]  # F14: Road Safety Sum
 
-                vertices = _simplify_by_inflection(pts)
-                areas = []
-                for i in range(len(vertices) - 1):
-                    polygon_pts = [pts[j] for j in range(vertices[i], vertices[i + 1] + 1)]
-                    if len(polygon_pts) >= 3:
-                        areas.append(_shoelace_area(polygon_pts))
-                    else:
-                        areas.append(0.0)
-                safety_sum = sum(areas)
-                safety_sums.append(safety_sum)
+        return np.argsort(-safety_sums)
 
-        order = np.argsort(-np.array(safety_sums))
-        return [test_cases[i].test_id for i in order]
+    @staticmethod
+    def _turn_area(d: np.ndarray) -> float:
+        cross = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
+        return float(np.abs(cross).sum())
 
 # =============================================================================
 #   Strategies Logic - Baseline
 # =============================================================================
-class LongestRoadFirstStrategy(PrioritizationStrategy):
+class LongestRoadFirstStrategy(_IndexOrderStrategy):
     """Prioritize test cases with the highest number of road points first."""
 
-    def prioritize(self, test_cases: List[TestCaseData]) -> List[str]:
-        sorted_cases = sorted(
-            test_cases,
-            key=lambda tc: len(tc.road_points),
-            reverse=True,
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        lens = np.fromiter(
+            (len(tc.road_points) for tc in test_cases), dtype=np.int64, count=len(test_cases),
         )
-        return [tc.test_id for tc in sorted_cases]
+        # stable on the negated key keeps input order among ties, like sorted(reverse=True)
+        return np.argsort(-lens, kind="stable")
 
 
-class TotalDistanceFirstStrategy(PrioritizationStrategy):
+class TotalDistanceFirstStrategy(_IndexOrderStrategy):
     """Prioritize test cases with the highest total geometric distance first."""
 
-    def prioritize(self, test_cases: List[TestCaseData]) -> List[str]:
-        sorted_cases = sorted(
-            test_cases,
-            key=lambda tc: self._total_distance(tc),
-            reverse=True,
+    def order(self, test_cases: List[TestCaseData]) -> np.ndarray:
+        distances = np.fromiter(
+            (self._total_distance(tc) for tc in test_cases), dtype=np.float64, count=len(test_cases),
         )
-        return [tc.test_id for tc in sorted_cases]
+        return np.argsort(-distances, kind="stable")
 
     @staticmethod
     def _total_distance(tc: TestCaseData) -> float:
-        total = 0.0
-        pts = tc.road_points
-        for i in range(1, len(pts)):
-            dx = pts[i][0] - pts[i - 1][0]
-            dy = pts[i][1] - pts[i - 1][1]
-            total += math.sqrt(dx * dx + dy * dy)
-        return total
+        return float(tc.seg_lens.sum())
 
 
 # =============================================================================
@@ -340,7 +420,8 @@ STRATEGY_REGISTRY: Dict[str, Type[PrioritizationStrategy]] = {
     "total-distance-first": TotalDistanceFirstStrategy,
     "euclidean-outlier-first": lambda: OutlierSortStrategy("euclidean"),
     "mahalanobis-outlier-first": lambda: OutlierSortStrategy("mahalanobis"),
-    "less-safe-first": LessSafeStrategy
+    "less-safe-first": LessSafeStrategy,
+    "less-safe-proxy-first": lambda: LessSafeStrategy(proxy=True),
 }
 
 
@@ -1,26 +1,33 @@
 import logging
-from datetime import datetime
-from pathlib import Path
+from datetime import datetime, timezone
+from typing import Iterator, Optional
 import time
-import csv
-import io
+
+import numpy as np
+
 from sdc_prioritizer.data_models.api_models import (
     UploadTestSuiteRequest,
     UploadTestSuiteResponse,
+    BatchUploadTestSuiteRequest,
+    BatchUploadTestSuiteResponse,
     PrioritizeResponse,
     EvaluateRequest,
     EvaluateResponse,
 )
 from sdc_prioritizer.domain.strategies import get_strategy
-from sdc_prioritizer.domain.evaluation import mock_has_failed, compute_apfd
+from sdc_prioritizer.domain.evaluation import mock_has_failed, mock_has_failed_batch, compute_apfd
 from sdc_prioritizer.persistence.mongo_repository import MongoTestCaseRepository
 from sdc_prioritizer.persistence.postgres_repository import PostgresTestSuiteRepository
-from sdc_prioritizer.utils.exceptions import TestSuiteAlreadyExistsError, TestSuiteNotFoundError
+from sdc_prioritizer.utils.exceptions import (
+    PersistenceError,
+    TestSuiteAlreadyExistsError,
+    TestSuiteNotFoundError,
+)
 
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -36,9 +43,12 @@ class TestSuiteService:
     - PostgreSQL  → test suites metadata, evaluation history
     - MongoDB     → full test case documents with all road points
 
-    The check for duplicate suite_id is done first in PostgreSQL (the
-    authoritative metadata store). If that passes, road points are written
-    to MongoDB.
+    An upload runs in one PostgreSQL unit of work: the suite_id is claimed in
+    PostgreSQL (the authoritative metadata store) with a single insert that
+    fails on duplicates, road points are written to MongoDB, and only then is
+    the claim committed. Should the MongoDB write or the commit fail, the
+    claim is rolled back and any road points written are removed, so the
+    upload can be retried.
     """
 
     def __init__(
@@ -48,7 +58,6 @@ class TestSuiteService:
     ) -> None:
         self._mongo = mongo_repo
         self._postgres = postgres_repo
-
     # -------------------------------------------------------------------------
     def upload_test_suite(self, request: UploadTestSuiteRequest) -> UploadTestSuiteResponse:
         """Validate, store, and confirm a test suite upload.
@@ -70,20 +79,30 @@ class TestSuiteService:
             "Uploading test suite '%s' with %d test cases.", suite_id, len(test_cases)
         )
 
-        # 1. Guard: check for duplicates before touching any DB
-        if self._postgres.suite_exists(suite_id):
-            raise TestSuiteAlreadyExistsError(
-                f"Test suite '{suite_id}' has already been uploaded."
-            )
-
-        # 2. Write road points to MongoDB
-        self._mongo.insert_test_cases(suite_id=suite_id, test_cases=test_cases)
-        logger.debug("MongoDB write complete for suite '%s'.", suite_id)
-
-        # 3. Write metadata + precomputed geometry to PostgreSQL
-        created_at: datetime = self._postgres.insert_suite(
-            suite_id=suite_id, test_count=len(test_cases)
-        )
+        # 1. Guard: claim the suite_id in PostgreSQL (atomic check + insert,
+        #    raises TestSuiteAlreadyExistsError if taken), committed only once
+        #    road points are stored: a failed MongoDB write rolls the claim back
+        claimed = False
+        try:
+            with self._postgres.unit_of_work() as cur:
+                created_at: datetime = self._postgres.insert_suite(
+                    suite_id=suite_id, test_count=len(test_cases), cur=cur
+                )
+                claimed = True
+
+                # 2. Write road points to MongoDB inside the claim's transaction
+                self._mongo.insert_test_cases(suite_id=suite_id, test_cases=test_cases)
+                logger.debug("MongoDB write complete for suite '%s'.", suite_id)
+        except Exception:
+            # Holding the claim, every MongoDB document of the suite is this upload's
+            # (or an orphan): remove those written by the concurrent batches or
+            # before a failed commit, so that a retry is not refused
+            if claimed:
+                try:
+                    self._mongo.delete_test_cases(suite_id)
+                except PersistenceError:
+                    pass  # already logged; the upload's own error is raised below
+            raise
         logger.debug("PostgreSQL write complete for suite '%s'.", suite_id)
 
         logger.info("Test suite '%s' uploaded successfully.", suite_id)
@@ -94,6 +113,41 @@ class TestSuiteService:
             createdAt=created_at,
         )
 
+    # -------------------------------------------------------------------------
+    def upload_test_suites_batch(
+        self, request: BatchUploadTestSuiteRequest
+    ) -> BatchUploadTestSuiteResponse:
+        """Upload several test suites in one call.
+
+        Each suite goes through ``upload_test_suite``; a failing suite does
+        not abort the others, its outcome is reported as the status code the
+        single-suite endpoint would have returned.
+
+        Args:
+            request: Validated batch upload request.
+
+        Returns:
+            Response mapping each testSuiteId to 201, 409 or 500.
+        """
+        logger.info("Batch uploading %d test suites.", len(request.suites))
+
+        results = {}
+        for suite in request.suites:
+            try:
+                self.upload_test_suite(suite)
+                results[suite.testSuiteId] = 201
+            except TestSuiteAlreadyExistsError:
+                logger.warning("Duplicate upload attempt for suite '%s'.", suite.testSuiteId)
+                results[suite.testSuiteId] = 409
+            except PersistenceError:
+                logger.exception("Persistence failure for suite '%s'.", suite.testSuiteId)
+                results[suite.testSuiteId] = 500
+
+        uploaded = sum(code == 201 for code in results.values())
+        logger.info("Batch upload complete: %d/%d suites stored.", uploaded, len(results))
+
+        return BatchUploadTestSuiteResponse(results=results, uploaded=uploaded)
+
     # -------------------------------------------------------------------------
     def prioritize_test_suite(self, suite_id: str, strategy_name: str) -> PrioritizeResponse:
         """
@@ -122,7 +176,7 @@ class TestSuiteService:
             suite_id, strategy_name,
         )
 
-        # 1. Guard: check suite exists (fast check in PostgreSQL)
+        # 1. Guard: check suite exists (in-memory, else fast check in PostgreSQL)
         if not self._postgres.suite_exists(suite_id):
             raise TestSuiteNotFoundError(f"Test suite '{suite_id}' not found.")
 
@@ -151,7 +205,9 @@ class TestSuiteService:
         """
         Evaluates a test suite using a specified prioritization strategy and computes
         metrics such as failure counts, execution costs, and APFD score. It
-        also saves the evaluation report to PostgreSQL for future persistance.
+        also saves the evaluation report to PostgreSQL for future persistance:
+        the report's ID is reserved up front and the row itself is written by a
+        background flusher, so the insert is not on the response path.
 
         Args:
             request (EvaluateRequest): A request object containing the test suite ID,
@@ -164,8 +220,9 @@ class TestSuiteService:
                 failures detected, execution cost, and APFD score.
 
         Raises:
-            TestSuiteNotFoundError: If the specified test suite does not exist in the
-                PostgreSQL database.
+            TestSuiteNotFoundError: If the specified test suite is not registered in the
+                PostgreSQL database or has no test cases in MongoDB.
+            StrategyNotFoundError: If the specified prioritization strategy is not available.
         """
         suite_id = request.testSuiteId
         strategy_name = request.strategy
@@ -176,45 +233,45 @@ class TestSuiteService:
 
         start_time = time.time() # Measures execution time
 
-        # 1. Guard: check suite exists
+        # 1. Guard: check suite exists (in-memory, else fast check in PostgreSQL).
+        #    An upload commits its PostgreSQL row only after all its road points are
+        #    in MongoDB, so a registered suite is never read half-written
         if not self._postgres.suite_exists(suite_id):
-            raise TestSuiteNotFoundError(f"Test suite '{suite_id}' not found in PostgreSQL - Please upload test suite.")
+            raise TestSuiteNotFoundError(f"Test suite '{suite_id}' not found - Please upload test suite.")
 
         # 2. Fetch strategy
         strategy = get_strategy(strategy_name)
 
         # 3. Fetch road points from MongoDB
         test_cases = self._mongo.get_test_cases_for_suite(suite_id)
+        if not test_cases:
+            raise TestSuiteNotFoundError(f"Test suite '{suite_id}' not found - Please upload test suite.")
 
-        # 4. Prioritize
-        ordered_ids = strategy.prioritize(test_cases)
+        # 4. Prioritize, as positions into test_cases
+        ordered = [test_cases[i] for i in strategy.order(test_cases).tolist()]
+        ordered_ids = [tc.test_id for tc in ordered]
 
         # 5. Simulate execution in prioritized order
-        tc_map = {tc.test_id: tc for tc in test_cases}
-        failure_map = {}
-        failures = 0
-        execution_cost = 0
-        remaining = None
-
-        for test_id in ordered_ids:
-            tc = tc_map[test_id]
-
-            # Budget mode: stop if budget would be exceeded
-            if request.budget is not None and execution_cost >= request.budget:
-                break
 
-            # Budget mode: compute used points a set limit to test simulation
-            if request.budget is not None:
-                remaining = request.budget - execution_cost
+        # Get failed tests and road points executed by each one without limit:
+        failed, costs = mock_has_failed_batch(ordered)
 
-            # Get failed test and road points executed or limit:
-            failed, test_execution_cost = mock_has_failed(tc, max_points=remaining)
+        if request.budget is not None:
+            # Budget mode: a test runs while the cost spent before it is under budget
+            spent = np.cumsum(costs) - costs
+            executed = int(np.searchsorted(spent, request.budget))
+            failed, costs = failed[:executed], costs[:executed]
 
-            failure_map[test_id] = failed
-            execution_cost += test_execution_cost
+            # Only the last executed test can be cut short: replay it with the remaining points
+            # (a failure on its very last allowed point is not detected under a limit)
+            if executed:
+                remaining = request.budget - int(spent[executed - 1])
+                if costs[-1] >= remaining:
+                    failed[-1], costs[-1] = mock_has_failed(ordered[executed - 1], max_points=remaining)
 
-            if failed:
-                failures += 1
+        failure_map = {ordered_ids[i]: True for i in np.flatnonzero(failed)}
+        failures = int(failed.sum())
+        execution_cost = int(costs.sum())
 
         # 6. Compute APFD score
         score = compute_apfd(ordered_ids, failure_map)
@@ -222,8 +279,11 @@ class TestSuiteService:
         # 7. Compute duration
         duration_ms = int((time.time() - start_time) * 1000)
 
-        # 8. Store evaluation report in PostgreSQL
-        evaluation_id = self._postgres.save_evaluation(
+        # 8. Store evaluation report in PostgreSQL behind the response: the row is
+        #    queued under a reserved evaluation ID
+        evaluation_id = self._postgres.reserve_evaluation_id()
+        self._postgres.enqueue_evaluation(
+            evaluation_id=evaluation_id,
             suite_id=suite_id,
             strategy=strategy_name,
             test_count=len(test_cases),
@@ -249,36 +309,37 @@ class TestSuiteService:
         )
 
     # -------------------------------------------------------------------------
-    def export_history_csv(self) -> str:
-        """Export all evaluation sessions as a CSV string.
+    def export_history_csv(
+        self, since: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Export evaluation sessions as CSV, newest first, in chunks of bytes.
+
+        PostgreSQL encodes the CSV itself (``COPY ... TO STDOUT``) with the
+        header matching the PDF spec: session_id, timestamp, strategy,
+        num_tests, num_failures, execution_cost, score, duration_ms. The
+        query runs on the first ``next()`` call, whose chunk starts with the
+        header, so database errors surface before any output is sent. Memory
+        stays constant in the size of the history.
+
+        Args:
+            since: Only export sessions created after this instant; a naive
+                datetime is taken as UTC. All sessions when None.
+            limit: Export at most this many sessions, the newest ones.
 
         Returns:
-            CSV-formatted string ready for download.
+            Iterator over CSV bytes (header line first) ready for download.
+
+        Raises:
+            PersistenceError: On database failure, from the first ``next()`` call.
         """
-        logger.info("Exporting evaluation history as CSV.")
-
-        rows = self._postgres.get_evaluation_history()
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header matching PDF spec
-        writer.writerow([
-            "session_id", "timestamp", "strategy", "num_tests",
-            "num_failures", "execution_cost", "score", "duration_ms",
-        ])
-
-        for row in rows:
-            writer.writerow([
-                row[0],  # evaluation_id → session_id
-                row[8],  # created_at → timestamp
-                row[2],  # strategy
-                row[3],  # test_count → num_tests
-                row[4],  # failures_detected → num_failures
-                row[5],  # execution_cost
-                row[6],  # score
-                row[7],  # duration_ms
-            ])
-
-        logger.info("Exported %d evaluation records.", len(rows))
-        return output.getvalue()
\ No newline at end of file
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        logger.info("Exporting evaluation history as CSV (since=%s, limit=%s).", since, limit)
+
+        size = 0
+        for chunk in self._postgres.iter_evaluation_history_csv(since=since, limit=limit):
+            size += len(chunk)
+            yield chunk
+
+        logger.info("Exported evaluation history: %d bytes.", size)
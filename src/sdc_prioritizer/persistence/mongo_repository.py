@@ -1,18 +1,48 @@
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import List
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
-from pymongo import MongoClient, ASCENDING
+import numpy as np
+from pymongo import MongoClient, ASCENDING, WriteConcern
 from pymongo.collection import Collection
-from pymongo.errors import DuplicateKeyError
-from sdc_prioritizer.data_models.api_models import TestCase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from sdc_prioritizer.data_models.api_models import RoadPoint, TestCase
 from sdc_prioritizer.utils.exceptions import PersistenceError, TestSuiteAlreadyExistsError
 from sdc_prioritizer.domain.strategies import TestCaseData
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#   Write Settings
+# =============================================================================
+INSERT_BATCH_SIZE = 1000      # documents per insert_many round trip
+DUPLICATE_KEY_CODE = 11000    # MongoDB E11000 duplicate key error
+MAX_INSERT_WORKERS = min(8, os.cpu_count() or 1)  # concurrent batches of one upload
+
+
+# =============================================================================
+#   Read Settings
+# =============================================================================
+FETCH_CACHE_SIZE = 64         # suites whose test cases are kept in memory
+FETCH_CACHE_TTL = 600.0       # seconds a cached suite is served before re-reading
+SUITE_INDEX = "idx_suite_test"  # (suite_id, test_id) index used by suite reads
+
+
+# =============================================================================
+#   Storage Layout
+# =============================================================================
+COORD_DTYPE = np.dtype("<f8")  # xs / ys binary element type, lossless for JSON floats
+_GET_X = attrgetter("x")
+_GET_Y = attrgetter("y")
 
 
 # =============================================================================
@@ -25,12 +55,29 @@ class MongoTestCaseRepository:
     One document per test case, stored in the configured collection.
     A unique compound index on (test_id, suite_id) prevents duplicate uploads.
 
+    Road points are stored as two parallel coordinate vectors ``xs`` and ``ys``
+    in road order, each a BSON binary of little-endian float64 values, which
+    decodes straight into NumPy without a Python float per coordinate.
+    Documents written before this layout keep either plain arrays of doubles
+    in ``xs`` / ``ys`` or a ``road_points`` list of ``{sequenceNumber, x, y}``
+    subdocuments, and are still read back.
+
     Duplicated error raised through DuplicateKeyError:
         example: suite_01, test_010, test_010
     """
 
     def __init__(self, client: MongoClient, database: str, collection: str) -> None:
         self._collection: Collection = client[database][collection]
+        # Uploads are acknowledged by the primary without waiting for the journal
+        self._fast_collection: Collection = self._collection.with_options(
+            write_concern=WriteConcern(w=1, j=False),
+        )
+        # suite_id -> (expiry, test cases); road points never change after
+        # upload, so an evaluate following a prioritize reuses the same read
+        self._fetch_cache: "OrderedDict[str, Tuple[float, Tuple[TestCaseData, ...]]]" = OrderedDict()
+        self._fetch_lock = threading.Lock()
+        # bumped by every invalidation; a read that overlapped one is not cached
+        self._fetch_generation = 0
         self._ensure_indexes()
 
     # -------------------------------------------------------------------------
@@ -42,9 +89,11 @@ class MongoTestCaseRepository:
             unique=True,
             name="uq_test_suite",
         )
+        # Suite reads and the suite_exists count filter on suite_id, which is
+        # this index's prefix (it replaces the former single-field idx_suite_id)
         self._collection.create_index(
-            [("suite_id", ASCENDING)],
-            name="idx_suite_id",
+            [("suite_id", ASCENDING), ("test_id", ASCENDING)],
+            name=SUITE_INDEX,
         )
         logger.debug("MongoDB indexes ensured on collection '%s'.", self._collection.name)
 
@@ -53,15 +102,60 @@ class MongoTestCaseRepository:
         """Return True if at least one document for the given suite_id exists."""
         return self._collection.count_documents({"suite_id": suite_id}, limit=1) > 0
 
+    # -------------------------------------------------------------------------
+    def _cached_test_cases(self, suite_id: str) -> Optional[Tuple[TestCaseData, ...]]:
+        """Return the cached test cases of a suite, or None if missing or expired."""
+        with self._fetch_lock:
+            entry = self._fetch_cache.get(suite_id)
+            if entry is None:
+                return None
+            expiry, test_cases = entry
+            if expiry <= time.monotonic():
+                del self._fetch_cache[suite_id]
+                return None
+            self._fetch_cache.move_to_end(suite_id)
+            return test_cases
+
+    # -------------------------------------------------------------------------
+    def _cache_test_cases(
+        self, suite_id: str, test_cases: Tuple[TestCaseData, ...], generation: int
+    ) -> None:
+        """
+        Store a suite's test cases, evicting the least recently used suite when full.
+
+        The store is dropped if the cache was invalidated since ``generation``
+        was taken: the read may have seen an upload that was still in progress.
+        """
+        with self._fetch_lock:
+            if generation != self._fetch_generation:
+                return
+            self._fetch_cache[suite_id] = (time.monotonic() + FETCH_CACHE_TTL, test_cases)
+            self._fetch_cache.move_to_end(suite_id)
+            while len(self._fetch_cache) > FETCH_CACHE_SIZE:
+                self._fetch_cache.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    def _invalidate_test_cases(self, suite_id: str) -> None:
+        """Drop a suite from the fetch cache."""
+        with self._fetch_lock:
+            self._fetch_generation += 1
+            self._fetch_cache.pop(suite_id, None)
+
     # -------------------------------------------------------------------------
     def get_test_cases_for_suite(self, suite_id: str) -> List[TestCaseData]:
         """
         Fetches test cases associated with a specific suite from the database.
 
         This method retrieves test case documents from the MongoDB collection based
-        on the provided suite ID. It processes the documents to extract relevant
-        data and constructs a list of `TestCaseData` objects, each of which
-        contains the test ID and sorted road points for the test case.
+        on the provided suite ID. Road points are read from the ``xs`` / ``ys``
+        vectors; legacy documents have their ``road_points`` sorted by sequence
+        number and reduced to ``[x, y]`` pairs by the aggregation pipeline, so
+        MongoDB does the sorting. Each document then becomes a `TestCaseData`
+        object with the test ID and its ordered road points.
+
+        Non-empty results are cached per suite for ``FETCH_CACHE_TTL`` seconds
+        and the same (frozen) `TestCaseData` objects are handed out again, so
+        their derived road geometry and features are computed only once.
 
         Args:
             suite_id (str): The unique identifier of the test suite for which
@@ -76,20 +170,39 @@ class MongoTestCaseRepository:
             PersistenceError: Raised when there is an issue fetching test cases
             from the database.
         """
+        pipeline = [
+            {"$match": {"suite_id": suite_id}},
+            {"$project": {
+                "_id": 0,
+                "test_id": 1,
+                "xs": 1,
+                "ys": 1,
+                # legacy layout: extract actual points per rows, ordered server-side
+                "pts": {"$cond": [
+                    {"$isArray": "$road_points"},
+                    {"$map": {
+                        "input": {"$sortArray": {"input": "$road_points", "sortBy": {"sequenceNumber": 1}}},
+                        "as": "rp",
+                        "in": ["$$rp.x", "$$rp.y"],
+                    }},
+                    "$$REMOVE",
+                ]},
+            }},
+        ]
+
+        cached = self._cached_test_cases(suite_id)
+        if cached is not None:
+            logger.debug("Serving %d test cases of suite '%s' from cache.", len(cached), suite_id)
+            return list(cached)
 
+        with self._fetch_lock:
+            generation = self._fetch_generation
         try:
-            docs = self._collection.find({"suite_id": suite_id})
-            results = []
-            for doc in docs:
-                road_points = [
-                    (rp["x"], rp["y"])
-                    for rp in sorted(doc["road_points"], key=lambda r: r["sequenceNumber"]) # extract actual points per rows
-                ]
-                results.append(TestCaseData(
-                    test_id=doc["test_id"],
-                    road_points=road_points,
-                ))
-            return results
+            docs = self._collection.aggregate(pipeline, batchSize=1000, hint=SUITE_INDEX)
+            test_cases = tuple(
+                TestCaseData(test_id=doc["test_id"], road_points=self._road_points(doc))
+                for doc in docs
+            )
 
         except Exception as exc:
             logger.exception("Failed to fetch test cases from MongoDB for suite '%s'.", suite_id)
@@ -97,6 +210,47 @@ class MongoTestCaseRepository:
                 "Failed to fetch test cases from MongoDB."
             ) from exc
 
+        if test_cases:
+            # an unknown suite is not cached: it may be uploaded at any moment
+            self._cache_test_cases(suite_id, test_cases, generation)
+        return list(test_cases)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _road_points(doc: dict) -> np.ndarray:
+        """Ordered (n, 2) road points of a projected document, in any layout."""
+        xs = doc.get("xs")
+        if isinstance(xs, bytes):
+            # binary subtype 0 is decoded by PyMongo as bytes
+            return np.column_stack([
+                np.frombuffer(xs, dtype=COORD_DTYPE),
+                np.frombuffer(doc["ys"], dtype=COORD_DTYPE),
+            ]).astype(np.float64, copy=False)
+        if xs is not None:
+            return np.column_stack([
+                np.asarray(xs, dtype=np.float64),
+                np.asarray(doc["ys"], dtype=np.float64),
+            ])
+        return np.array(doc["pts"], dtype=np.float64).reshape(-1, 2)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _coordinates(road_points: List[RoadPoint], coordinate: attrgetter) -> bytes:
+        """Binary ``COORD_DTYPE`` vector of one coordinate of the road points, in order."""
+        return np.fromiter(
+            map(coordinate, road_points), dtype=COORD_DTYPE, count=len(road_points),
+        ).tobytes()
+
+    # -------------------------------------------------------------------------
+    def _insert_batch(self, documents: List[dict]) -> int:
+        """Insert one batch of documents unordered and return how many were written."""
+        result = self._fast_collection.insert_many(
+            documents,
+            ordered=False,
+            bypass_document_validation=True,
+        )
+        return len(result.inserted_ids)
+
     # -------------------------------------------------------------------------
     def insert_test_cases(self, suite_id: str, test_cases: List[TestCase]) -> None:
         """
@@ -104,7 +258,8 @@ class MongoTestCaseRepository:
 
         Before inserting the test cases, the method ensures that the specified test
         suite does not already exist. Each test case is processed to extract relevant
-        data, including road points and creation timestamp.
+        data, including road points (as parallel binary ``xs`` / ``ys`` vectors) and
+        creation timestamp.
 
         Args:
             suite_id: The unique identifier for the test suite.
@@ -125,28 +280,75 @@ class MongoTestCaseRepository:
             {
                 "test_id": tc.testId,
                 "suite_id": suite_id,
-                "road_points": [
-                    {"sequenceNumber": rp.sequenceNumber, "x": rp.x, "y": rp.y}
-                    for rp in tc.roadPoints
-                ],
+                # roadPoints are validated to be in sequenceNumber order already
+                "xs": self._coordinates(tc.roadPoints, _GET_X),
+                "ys": self._coordinates(tc.roadPoints, _GET_Y),
                 "created_at": now,
             }
             for tc in test_cases
         ] # tests cases extraction from input .json
 
+        self._invalidate_test_cases(suite_id)
+
+        batches = [
+            documents[i:i + INSERT_BATCH_SIZE]
+            for i in range(0, len(documents), INSERT_BATCH_SIZE)
+        ]
+
         try:
-            result = self._collection.insert_many(documents, ordered=False)
+            if len(batches) > 1:
+                # MongoClient is thread-safe: BSON encoding and server round trips overlap
+                workers = min(MAX_INSERT_WORKERS, len(batches))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    inserted = sum(pool.map(self._insert_batch, batches))
+            else:
+                inserted = sum(map(self._insert_batch, batches))
             logger.info(
                 "Inserted %d test case documents for suite '%s'.",
-                len(result.inserted_ids),
+                inserted,
                 suite_id,
             )
         except DuplicateKeyError as exc:
             raise TestSuiteAlreadyExistsError(
                 f"Test suite '{suite_id}' contains test cases that already exist."
             ) from exc
+        except BulkWriteError as exc:
+            # Unordered inserts report duplicates as write errors of the batch
+            write_errors = exc.details.get("writeErrors", [])
+            if write_errors and all(e.get("code") == DUPLICATE_KEY_CODE for e in write_errors):
+                raise TestSuiteAlreadyExistsError(
+                    f"Test suite '{suite_id}' contains test cases that already exist."
+                ) from exc
+            logger.exception("MongoDB insert_many failed for suite '%s'.", suite_id)
+            raise PersistenceError("Failed to persist test cases in MongoDB.") from exc
         except Exception as exc:
             logger.exception("MongoDB insert_many failed for suite '%s'.", suite_id)
             raise PersistenceError("Failed to persist test cases in MongoDB.") from exc
+        finally:
+            # a read racing the insert may have cached a partial suite
+            self._invalidate_test_cases(suite_id)
 
+    # -------------------------------------------------------------------------
+    def delete_test_cases(self, suite_id: str) -> None:
+        """
+        Removes every test case document of a test suite.
+
+        Used to undo a failed upload, including the batches ``insert_test_cases``
+        wrote before another one failed, so the upload can be retried.
+
+        Args:
+            suite_id: The unique identifier for the test suite.
 
+        Raises:
+            PersistenceError: If the delete fails.
+        """
+        self._invalidate_test_cases(suite_id)
+        try:
+            result = self._collection.delete_many({"suite_id": suite_id})
+        except Exception as exc:
+            logger.exception("MongoDB delete_many failed for suite '%s'.", suite_id)
+            raise PersistenceError("Failed to remove test cases from MongoDB.") from exc
+
+        logger.info(
+            "Removed %d test case documents for suite '%s'.", result.deleted_count, suite_id,
+        )
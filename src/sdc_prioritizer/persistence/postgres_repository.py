@@ -1,7 +1,11 @@
 import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Set, Tuple
+from psycopg import Cursor, OperationalError
 from psycopg_pool import ConnectionPool
 
 from sdc_prioritizer.utils.exceptions import PersistenceError, TestSuiteAlreadyExistsError
@@ -9,7 +13,18 @@ from sdc_prioritizer.utils.exceptions import PersistenceError, TestSuiteAlreadyE
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+#   Write-behind Settings
+# =============================================================================
+EVAL_FLUSH_INTERVAL = 0.1     # default seconds between background flushes of queued evaluations
+EVAL_FLUSH_BATCH = 500        # default evaluations written per INSERT
+EVAL_MAX_PENDING = 10_000     # queue length past which evaluations are written inline
+EVAL_RETRY_WINDOW = 60.0      # seconds an evaluation is retried after its first failed write
+EVAL_EXPORT_FLUSH_WAIT = 5.0  # seconds an export waits for a flush already in progress
+COPY_CHUNK_BYTES = 64 * 1024  # history CSV bytes gathered per streamed chunk
 
 
 # =============================================================================
@@ -22,63 +37,217 @@ class PostgresTestSuiteRepository:
     Stores (Tables):
     - test_suites  → one row per uploaded suite
     - evaluation_history → one row per evaluation run
+
+    Statements run on every request are executed with ``prepare=True``: each
+    pooled connection parses and plans them once, on their first use.
+
+    Evaluation records can be written behind the request: ``enqueue_evaluation``
+    queues a row whose id was reserved with ``reserve_evaluation_id`` and a
+    daemon thread stores queued rows every ``flush_interval`` seconds, up to
+    ``flush_batch`` rows per multi-row INSERT. ``close`` flushes what is left.
+    Rows the database could not be reached for are retried on the next flushes
+    for up to ``EVAL_RETRY_WINDOW`` seconds; a batch rejected by the database is
+    written row by row, so only the offending rows are dropped.
+
+    Writes that belong together can share a single connection and transaction
+    through ``unit_of_work``: methods accepting a ``cur`` argument run on the
+    given cursor and leave the commit to the unit of work.
     """
 
-    def __init__(self, pool: ConnectionPool) -> None:
+    def __init__(
+            self,
+            pool: ConnectionPool,
+            flush_batch: int = EVAL_FLUSH_BATCH,
+            flush_interval: float = EVAL_FLUSH_INTERVAL,
+    ) -> None:
         self._pool = pool
+        # suite_ids registered by this process or seen in test_suites; single set
+        # operations are atomic under the GIL, so request threads share it unlocked
+        self._known_suites: Set[str] = set()
+        self._flush_batch = flush_batch
+        self._flush_interval = flush_interval
+        self._pending: "queue.Queue[tuple]" = queue.Queue()
+        self._closing = threading.Event()
+        # held for "not closing, so queue it": no row can be queued after close()
+        self._enqueue_lock = threading.Lock()
+        # held while queued rows are written, by the flusher or by an export
+        self._flush_lock = threading.Lock()
+        # (row, time of its first failed write) to write again; under _flush_lock
+        self._retry: List[Tuple[tuple, float]] = []
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="evaluation-flusher", daemon=True,
+        )
+        self._flusher.start()
+
+    # -------------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop the background flusher after writing every queued evaluation.
+
+        Must be called before the connection pool is closed. Evaluations enqueued
+        from then on are written inline.
+        """
+        with self._enqueue_lock:
+            self._closing.set()
+        self._flusher.join()
+
+    # -------------------------------------------------------------------------
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Cursor]:
+        """Hold one pooled connection and transaction across several repository calls.
+
+        The yielded cursor is passed as ``cur`` to the methods taking it. The
+        transaction is committed when the block exits normally (one COMMIT for
+        all the statements) and rolled back if it raises, in which case the
+        exception propagates unchanged.
+
+        Yields:
+            Cursor: Cursor bound to the unit of work's connection.
+
+        Raises:
+            PersistenceError: If no connection can be obtained or the commit fails.
+        """
+        in_block = False
+        try:
+            with self._pool.connection() as conn:
+                with conn.cursor() as cur:
+                    in_block = True
+                    yield cur
+                    in_block = False
+                conn.commit()
+
+        except Exception as exc:
+            if in_block:
+                raise  # the block's own error, after the rollback
+            logger.exception("PostgreSQL unit of work failed.")
+            raise PersistenceError(
+                "Failed to commit the PostgreSQL transaction."
+            ) from exc
 
     # -------------------------------------------------------------------------
     def suite_exists(self, suite_id: str) -> bool:
-        """Return True if the suite_id is already registered."""
+        """Return True if the suite_id is already registered.
+
+        Registered suites are never removed, so a suite_id found once is
+        remembered and answered without a query afterwards.
+        """
+        if suite_id in self._known_suites:
+            return True
+
         with self._pool.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT 1 FROM test_suites WHERE suite_id = %s LIMIT 1",
                     (suite_id,),
+                    prepare=True,
                 )
-                return cur.fetchone() is not None
+                exists = cur.fetchone() is not None
+
+        if exists:
+            self._known_suites.add(suite_id)
+        return exists
 
     # -------------------------------------------------------------------------
-    def insert_suite(self, suite_id: str, test_count: int) -> datetime:
+    def insert_suite(self, suite_id: str, test_count: int, cur: Optional[Cursor] = None) -> datetime:
         """
-        Inserts a test suite record into the PostgreSQL database.
+        Inserts a test suite record into the PostgreSQL database unless its suite_id
+        is already taken.
+
+        The existence check and the insert are a single atomic statement
+        (``ON CONFLICT DO NOTHING``), so two concurrent uploads of the same suite
+        cannot both succeed and no separate ``suite_exists`` round trip is needed.
 
         Args:
             suite_id: Unique identifier of the test suite.
             test_count: Number of tests contained in the test suite.
+            cur: Cursor of a ``unit_of_work`` to run the insert in; the suite is then
+                only registered once that unit of work commits. Without it the insert
+                is committed on its own connection.
 
         Returns:
             datetime: The UTC timestamp representing when the suite was created and persisted.
 
         Raises:
+            TestSuiteAlreadyExistsError: If a suite with this suite_id already exists.
             PersistenceError: If attempting to persist data in PostgreSQL fails due to any exception.
         """
-        now = datetime.now(tz=timezone.utc)
+        try:
+            if cur is not None:
+                row = self._insert_suite_row(cur, suite_id, test_count)
+            else:
+                with self._pool.connection() as conn:
+                    with conn.cursor() as own_cur:
+                        row = self._insert_suite_row(own_cur, suite_id, test_count)
+                    conn.commit()
+
+        except Exception as exc:
+            logger.exception("PostgreSQL insert failed for suite '%s'.", suite_id)
+            raise PersistenceError(
+                "Failed to persist suite metadata in PostgreSQL."
+            ) from exc
+
+        if row is None:
+            logger.info("Suite '%s' already registered in PostgreSQL.", suite_id)
+            raise TestSuiteAlreadyExistsError(
+                f"Test suite '{suite_id}' has already been uploaded."
+            )
+
+        if cur is None:
+            # inside a unit of work the row may still be rolled back; suite_exists
+            # remembers the suite on its first lookup after the commit instead
+            self._known_suites.add(suite_id)
+        logger.info("Persisted suite '%s' in PostgreSQL.", suite_id)
+        return row[0].astimezone(timezone.utc)  # psycopg returns the session time zone
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _insert_suite_row(cur: Cursor, suite_id: str, test_count: int) -> Optional[tuple]:
+        """Run the suite insert on ``cur``; return ``(created_at,)`` or None on conflict."""
+        # created_at defaults to now() on the server (db/init.sql)
+        cur.execute(
+            """
+            INSERT INTO test_suites (suite_id, test_count)
+            VALUES (%s, %s)
+            ON CONFLICT (suite_id) DO NOTHING
+            RETURNING created_at
+            """,
+            (suite_id, test_count),
+            prepare=True,
+        )
+        return cur.fetchone()
+
+    # -------------------------------------------------------------------------
+    def reserve_evaluation_id(self) -> int:
+        """
+        Draw the next evaluation ID from the evaluation_history sequence.
+
+        Lets an evaluation report its ID before its row is written. Sequence values are
+        never handed out twice, even if the transaction is rolled back.
+
+        Returns:
+            int: An evaluation ID not used by any other record.
 
+        Raises:
+            PersistenceError: If the sequence cannot be read.
+        """
         try:
             with self._pool.connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
-                        """
-                        INSERT INTO test_suites (suite_id, created_at, test_count)
-                        VALUES (%s, %s, %s)
-                        """,
-                        (suite_id, now, test_count),
+                        "SELECT nextval(pg_get_serial_sequence('evaluation_history', 'evaluation_id'))",
+                        prepare=True,
                     )
-                conn.commit()
-
-            logger.info("Persisted suite '%s' in PostgreSQL.", suite_id)
-            return now
+                    return cur.fetchone()[0]
 
         except Exception as exc:
-            logger.exception("PostgreSQL insert failed for suite '%s'.", suite_id)
+            logger.exception("Failed to reserve an evaluation id.")
             raise PersistenceError(
-                "Failed to persist suite metadata in PostgreSQL."
+                "Failed to reserve an evaluation id in PostgreSQL."
             ) from exc
 
     # -------------------------------------------------------------------------
-    def save_evaluation(
+    def enqueue_evaluation(
             self,
+            evaluation_id: int,
             suite_id: str,
             strategy: str,
             test_count: int,
@@ -86,16 +255,18 @@ class PostgresTestSuiteRepository:
             execution_cost: int,
             score: float,
             duration_ms: int,
-    ) -> int:
+    ) -> None:
         """
-        Persist an evaluation record in the evaluation history database table and returns
-        the generated evaluation ID.
+        Queue an evaluation record for the background flusher and return immediately.
 
-        This function inserts a new row into the `evaluation_history` table with the
-        provided evaluation details.
+        The record keeps the time it was queued as ``created_at``. When more than
+        ``EVAL_MAX_PENDING`` records are already waiting, or once ``close`` has been
+        called, it is written inline instead.
 
         Args:
-            suite_id (str): Suite identifier associated with the evaluation.
+            evaluation_id (int): ID obtained from ``reserve_evaluation_id``.
+            suite_id (str): Suite identifier associated with the evaluation; the suite
+                must be registered.
             strategy (str): Strategy used during the evaluation.
             test_count (int): Total number of tests executed during the evaluation.
             failures_detected (int): Number of test failures detected during the evaluation.
@@ -103,75 +274,269 @@ class PostgresTestSuiteRepository:
             score (float): Computed score for the evaluation.
             duration_ms (int): Time taken for the evaluation in milliseconds.
 
-        Returns:
-            int: The identifier of the newly created evaluation record.
+        Raises:
+            PersistenceError: If the record is written inline and storing it fails.
+        """
+        row = (evaluation_id, suite_id, strategy, test_count, failures_detected,
+               execution_cost, score, duration_ms, datetime.now(tz=timezone.utc))
+
+        # checked and queued under the lock: close() cannot slip in between, so
+        # the flusher's final drain always sees a queued row
+        with self._enqueue_lock:
+            waiting = self._pending.qsize() + len(self._retry)
+            queued = not self._closing.is_set() and waiting < EVAL_MAX_PENDING
+            if queued:
+                self._pending.put(row)
+
+        if not queued:
+            self.save_evaluations_bulk([row])
+
+    # -------------------------------------------------------------------------
+    def save_evaluations_bulk(self, rows: List[tuple]) -> None:
+        """
+        Persist many evaluation records carrying their own ID and timestamp in one statement.
+
+        The rows are sent as one array per column and expanded by ``unnest``, so any
+        batch size is a single prepared multi-row INSERT on one pooled connection.
+        This is how the background flusher stores queued evaluations.
+
+        Args:
+            rows (List[tuple]): One ``(evaluation_id, suite_id, strategy, test_count,
+                failures_detected, execution_cost, score, duration_ms, created_at)``
+                tuple per evaluation, ``evaluation_id`` obtained from
+                ``reserve_evaluation_id``.
 
         Raises:
-            PersistenceError: If an error occurs while storing the evaluation in the
-            database.
+            PersistenceError: If an error occurs while storing the evaluations in the
+            database. No row is stored in that case.
         """
+        if not rows:
+            return
+
+        columns = [list(column) for column in zip(*rows)]
         try:
             with self._pool.connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
                         """
                         INSERT INTO evaluation_history
-                        (suite_id, strategy, test_count, failures_detected,
-                         execution_cost, score, duration_ms)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING evaluation_id
+                        (evaluation_id, suite_id, strategy, test_count, failures_detected,
+                         execution_cost, score, duration_ms, created_at)
+                        SELECT * FROM unnest(
+                            %s::integer[], %s::varchar[], %s::varchar[], %s::integer[],
+                            %s::integer[], %s::integer[], %s::double precision[],
+                            %s::integer[], %s::timestamptz[]
+                        )
                         """,
-                        (suite_id, strategy, test_count, failures_detected,
-                         execution_cost, score, duration_ms),
+                        columns,
+                        prepare=True,
                     )
-                    evaluation_id = cur.fetchone()[0]
                 conn.commit()
 
-            logger.info(
-                "Stored evaluation #%d for suite '%s' strategy '%s'.",
-                evaluation_id, suite_id, strategy,
-            )
-            return evaluation_id
-
         except Exception as exc:
-            logger.exception("Failed to store evaluation for suite '%s'.", suite_id)
+            logger.exception(
+                "Failed to store evaluations %s.", [row[0] for row in rows],
+            )
             raise PersistenceError(
-                "Failed to store evaluation in PostgreSQL."
+                "Failed to store evaluations in PostgreSQL."
             ) from exc
 
+        logger.debug("Stored %d evaluations in bulk.", len(rows))
+
+    # -------------------------------------------------------------------------
+    def _flush_loop(self) -> None:
+        """Background thread: write queued evaluations until ``close`` is called."""
+        while True:
+            closing = self._closing.wait(self._flush_interval)
+            self._flush_pending()
+            if closing:
+                break
+
+        if self._retry:
+            logger.error(
+                "Evaluations %s not stored: PostgreSQL unreachable at shutdown.",
+                [row[0] for row, _ in self._retry],
+            )
+
+    # -------------------------------------------------------------------------
+    def _flush_pending(self, timeout: Optional[float] = None) -> bool:
+        """Write the evaluations to retry, then everything queued so far,
+        ``flush_batch`` records at a time.
+
+        Runs under ``_flush_lock``: a caller returns only once every row queued
+        before the call, including a batch the flusher was already writing, is
+        stored or kept for retry. Once a batch finds the database unreachable,
+        the remaining entries are kept for retry without further attempts, so an
+        outage costs one connection timeout per flush rather than one per batch.
+
+        Args:
+            timeout: Seconds to wait for a flush already in progress. Wait as
+                long as it takes when None.
+
+        Returns:
+            False if the flush was skipped because ``timeout`` ran out, else True.
+        """
+        if not self._flush_lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        try:
+            retry, self._retry = self._retry, []
+            reachable = True
+            for start in range(0, len(retry), self._flush_batch):
+                batch = retry[start:start + self._flush_batch]
+                if reachable:
+                    reachable = self._store_batch(batch)
+                else:
+                    self._defer(batch)
+
+            while True:
+                batch = []
+                try:
+                    while len(batch) < self._flush_batch:
+                        batch.append((self._pending.get_nowait(), None))
+                except queue.Empty:
+                    pass
+
+                if not batch:
+                    return True
+
+                if reachable:
+                    reachable = self._store_batch(batch)
+                else:
+                    self._defer(batch)
+        finally:
+            self._flush_lock.release()
+
+    # -------------------------------------------------------------------------
+    def _store_batch(self, batch: List[Tuple[tuple, Optional[float]]]) -> bool:
+        """Write a batch of ``(row, first failure time or None)`` entries.
+
+        If the database cannot be reached the batch is kept for retry. If it
+        rejects the statement, the rows are written one by one so that a single
+        bad row does not sink the others; rows rejected on their own are dropped.
+
+        Returns:
+            False if the database could not be reached, else True.
+        """
+        try:
+            self.save_evaluations_bulk([row for row, _ in batch])
+            return True
+        except PersistenceError as exc:
+            if isinstance(exc.__cause__, OperationalError):
+                self._defer(batch)
+                return False
+
+        for position, entry in enumerate(batch):
+            try:
+                self.save_evaluations_bulk([entry[0]])
+            except PersistenceError as exc:
+                if isinstance(exc.__cause__, OperationalError):
+                    self._defer(batch[position:])  # unreachable now: keep the rest too
+                    return False
+                logger.error("Evaluation #%d dropped: rejected by PostgreSQL.", entry[0][0])
+        return True
+
+    # -------------------------------------------------------------------------
+    def _defer(self, batch: List[Tuple[tuple, Optional[float]]]) -> None:
+        """Keep failed entries for the next flush, unless their retry window is over."""
+        now = time.monotonic()
+        expired = []
+        for row, failed_at in batch:
+            failed_at = now if failed_at is None else failed_at
+            if now - failed_at < EVAL_RETRY_WINDOW:
+                self._retry.append((row, failed_at))
+            else:
+                expired.append(row[0])
+
+        if expired:
+            logger.error(
+                "Evaluations %s dropped: not stored within %.0f s.", expired, EVAL_RETRY_WINDOW,
+            )
+
     # -------------------------------------------------------------------------
-    def get_evaluation_history(self) -> List[tuple]:
-        """Fetch all evaluation records for CSV export.
+    def iter_evaluation_history_csv(
+            self,
+            since: Optional[datetime] = None,
+            limit: Optional[int] = None,
+            chunk_size: int = COPY_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        """Stream evaluation records as CSV, newest first, encoded by PostgreSQL itself.
+
+        The export runs as ``COPY (SELECT ...) TO STDOUT WITH (FORMAT CSV,
+        HEADER)``, so rows are never turned into Python objects. The column aliases
+        are the CSV header of the export. Timestamps and scores are rendered as
+        Python's ``str`` does (``2026-01-01 12:00:00.123456+00:00``, microseconds
+        only when non-zero, always in UTC; ``1.0`` rather than ``1``), as the export
+        did when it was written with ``csv.writer``. Queued evaluations are written
+        before the export runs, so it includes every report already returned,
+        unless a flush has been stuck for ``EVAL_EXPORT_FLUSH_WAIT`` seconds. The
+        covering index on ``created_at DESC`` (db/init.sql) serves the filter, order
+        and limit without a sort. The single-row blocks of the COPY protocol are
+        joined into chunks of about ``chunk_size`` bytes. The pooled connection is
+        held until the iterator is exhausted or closed.
+
+        Args:
+            since: Only export records created after this instant (timezone-aware).
+                All records when None.
+            limit: Export at most this many records, the newest ones. No limit
+                when None.
+            chunk_size: Minimum number of bytes per yielded chunk (except the last).
 
         Returns:
-            List of tuples matching evaluation_history columns.
+            Iterator of CSV bytes, header line first.
 
         Raises:
             PersistenceError: On unexpected database failure.
         """
+        # Write the evaluations still queued first: a report returned before the
+        # export started must be part of it. A flush stuck on an unreachable
+        # database is not waited for: the export would fail anyway.
+        if not self._flush_pending(timeout=EVAL_EXPORT_FLUSH_WAIT):
+            logger.warning(
+                "Evaluation history exported without waiting for queued evaluations: "
+                "flush still running after %.0f s.", EVAL_EXPORT_FLUSH_WAIT,
+            )
+
         try:
             with self._pool.connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        SELECT evaluation_id,
-                               suite_id,
-                               strategy,
-                               test_count,
-                               failures_detected,
-                               execution_cost,
-                               score,
-                               duration_ms,
-                               created_at
-                        FROM evaluation_history
-                        ORDER BY created_at DESC
+                    # COPY takes no bind parameters: psycopg merges them client-side,
+                    # so a None since / limit folds away when the query is planned
+                    with cur.copy(
                         """
-                    )
-                    return cur.fetchall()
+                        COPY (
+                            SELECT evaluation_id     AS session_id,
+                                   to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS')
+                                   || CASE WHEN date_trunc('second', created_at) = created_at THEN ''
+                                           ELSE to_char(created_at AT TIME ZONE 'UTC', '.US') END
+                                   || '+00:00'       AS "timestamp",
+                                   strategy,
+                                   test_count        AS num_tests,
+                                   failures_detected AS num_failures,
+                                   execution_cost,
+                                   CASE WHEN score::text ~ '^-?[0-9]+$' THEN score::text || '.0'
+                                        ELSE score::text END AS score,
+                                   duration_ms
+                            FROM evaluation_history
+                            WHERE %(since)s::timestamptz IS NULL OR created_at > %(since)s
+                            ORDER BY created_at DESC
+                            LIMIT %(limit)s
+                        ) TO STDOUT WITH (FORMAT CSV, HEADER TRUE)
+                        """,
+                        {"since": since, "limit": limit},
+                    ) as copy:
+                        chunk = bytearray()
+                        for block in copy:
+                            chunk += block
+                            if len(chunk) >= chunk_size:
+                                yield bytes(chunk)
+                                chunk.clear()
+                        if chunk:
+                            yield bytes(chunk)
 
         except Exception as exc:
-            logger.exception("Failed to fetch evaluation history.")
+            logger.exception("Failed to stream evaluation history.")
             raise PersistenceError(
                 "Failed to fetch evaluation history from PostgreSQL."
             ) from exc
 
-    # -------------------------------------------------------------------------
\ No newline at end of file
+    # -------------------------------------------------------------------------
@@ -1,17 +1,19 @@
+import itertools
 import logging
-from pathlib import Path
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from sdc_prioritizer.data_models import ErrorResponse
 from sdc_prioritizer.domain.test_suite_service import TestSuiteService
-from sdc_prioritizer.utils.exceptions import PersistenceError
 
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 #   Router
@@ -34,38 +36,33 @@ def get_test_suite_service(request: Request) -> TestSuiteService:
     "/",
     summary="Export evaluation history as CSV.",
     description=(
-        "Returns all stored evaluation sessions as a downloadable CSV file. "
+        "Returns the stored evaluation sessions, newest first, as a downloadable "
+        "CSV file: all of them, or only those after `since` and at most `limit`. "
         "Columns: session_id, timestamp, strategy, num_tests, "
         "num_failures, execution_cost, score, duration_ms."
     ),
     status_code=status.HTTP_200_OK,
     responses={
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": ErrorResponse},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
     },
 )
 async def export_history(
+    since: Optional[datetime] = Query(
+        default=None, description="Only sessions created after this ISO 8601 timestamp (UTC if no offset).",
+    ),
+    limit: Optional[int] = Query(default=None, gt=0, description="Maximum number of sessions, newest first."),
     service: TestSuiteService = Depends(get_test_suite_service),
 ) -> StreamingResponse:
     """Export evaluation history as CSV."""
-    logger.debug("GET /v1/history/")
-
-    try:
-        csv_content = service.export_history_csv()
-        return StreamingResponse(
-            content=iter([csv_content]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=evaluation_history.csv"},
-        )
-
-    except PersistenceError as exc:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
+    logger.debug("GET /v1/history/ – since=%s, limit=%s", since, limit)
 
-    except Exception as exc:
-        logger.exception("Unexpected error exporting history.")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
\ No newline at end of file
+    chunks = service.export_history_csv(since=since, limit=limit)
+    # runs the query off the event loop: failures still become a JSON 500
+    first_chunk = await run_in_threadpool(next, chunks)  # starts with the header
+    # a sync iterator is consumed in the threadpool too, chunk by chunk
+    return StreamingResponse(
+        content=itertools.chain((first_chunk,), chunks),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=evaluation_history.csv"},
+    )
@@ -1,29 +1,31 @@
 import logging
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, Query, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sdc_prioritizer.data_models import (
     ErrorResponse,
     UploadTestSuiteRequest,
     UploadTestSuiteResponse,
+    BatchUploadTestSuiteRequest,
+    BatchUploadTestSuiteResponse,
     PrioritizeResponse,
     EvaluateRequest,
     EvaluateResponse
 )
+from sdc_prioritizer.data_models.api_models import SUITE_ID_PATTERN
 from sdc_prioritizer.domain.test_suite_service import TestSuiteService # API Layer knows about Services
 from sdc_prioritizer.domain.strategies import available_strategies
-from sdc_prioritizer.utils.exceptions import (
-    PersistenceError,
-    StrategyNotFoundError,
-    TestSuiteAlreadyExistsError,
-    TestSuiteNotFoundError,
-)
 
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+#   Route Descriptions
+# =============================================================================
+# Strategy names listed in the OpenAPI descriptions, joined once at import
+AVAILABLE_STRATEGIES = ", ".join(available_strategies())
 
 # =============================================================================
 #   Endpoint 1 - upload-test-suites
@@ -63,7 +65,7 @@ def get_test_suite_service(request: Request) -> TestSuiteService:
 async def upload_test_suite(
     body: UploadTestSuiteRequest,
     service: TestSuiteService = Depends(get_test_suite_service),
-) -> JSONResponse:
+) -> Response:
     """Upload test suite endpoint handler.
 
     Args:
@@ -75,33 +77,55 @@ async def upload_test_suite(
     """
     logger.debug("POST /test-suite/upload – suiteId='%s'", body.testSuiteId)
 
-    try:
-        response = service.upload_test_suite(body)
-        return JSONResponse(
-            status_code=status.HTTP_201_CREATED,
-            content=response.model_dump(mode="json"),
-        )
+    response = await run_in_threadpool(service.upload_test_suite, body)
+    # pydantic-core encodes the model straight to JSON bytes, without a dict in between
+    return Response(
+        content=response.model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
+
+
+# =============================================================================
+#   Endpoint 1 - upload-test-suite (batch)
+# =============================================================================
+@router.post(
+    "/batch",
+    summary="Batch test suites upload endpoint.",
+    description=(
+        "Accepts several test suites in a single request and stores each one "
+        "as the single-suite upload does. "
+        "Returns the per-suite outcome as HTTP status codes: "
+        "201 uploaded, 409 already exists, 500 persistence failure."
+    ),
+    response_model=BatchUploadTestSuiteResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+    },
+)
+async def upload_test_suites_batch(
+    body: BatchUploadTestSuiteRequest,
+    service: TestSuiteService = Depends(get_test_suite_service),
+) -> Response:
+    """Batch upload endpoint handler.
 
-    except TestSuiteAlreadyExistsError as exc:
-        logger.warning("Duplicate upload attempt for suite '%s'.", body.testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_409_CONFLICT,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
+    Args:
+        body: Validated batch payload, one UploadTestSuiteRequest per suite.
+        service: Injected TestSuiteService.
 
-    except PersistenceError as exc:
-        logger.exception("Persistence failure for suite '%s'.", body.testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
+    Returns:
+        200 with per-suite status codes, or 500 on unexpected failure.
+    """
+    logger.debug("POST /v1/test-suite/batch – %d suites", len(body.suites))
 
-    except Exception as exc: # non predicted
-        logger.exception("Unexpected error for suite '%s'.", body.testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
+    response = await run_in_threadpool(service.upload_test_suites_batch, body)
+    return Response(
+        content=response.model_dump_json(),
+        status_code=status.HTTP_200_OK,
+        media_type="application/json",
+    )
 
 
 # =============================================================================
@@ -113,7 +137,7 @@ async def upload_test_suite(
     description=("Applies a named prioritization strategy to an existing test suite. "
         "Returns the ordered list of test IDs. "
         "Stateless — no data is stored. "
-        f"Available strategies: {', '.join(available_strategies())}."
+        f"Available strategies: {AVAILABLE_STRATEGIES}."
     ),
     response_model=PrioritizeResponse,
     status_code=status.HTTP_200_OK,
@@ -124,10 +148,10 @@ async def upload_test_suite(
     },
 )
 async def prioritize_test_suite(
-    testSuiteId: str = Query(pattern=r"^suite_\d{2}$", description="Suite ID in format suite_XX"),
+    testSuiteId: str = Query(pattern=SUITE_ID_PATTERN, description="Suite ID in format suite_XX"),
     strategy: str = Query(min_length=1, description="Prioritization strategy name."),
     service: TestSuiteService = Depends(get_test_suite_service),
-) -> JSONResponse:
+) -> Response:
     """
     Prioritize a test suite using the specified strategy.
 
@@ -138,53 +162,29 @@ async def prioritize_test_suite(
         service (TestSuiteService): Dependency-injected service used to process the test suite.
 
     Returns:
-        JSONResponse: Contains the response with an ordered list of test IDs or an error message.
+        Response: Contains the response with an ordered list of test IDs or an error message.
 
     Raises:
         TestSuiteNotFoundError: If the specified test suite does not exist.
         StrategyNotFoundError: If the requested prioritization strategy is not found.
         PersistenceError: If there is a failure related to persistence.
         Exception: If any unexpected error occurs during execution.
+
+        Each error is turned into its ErrorResponse by the handlers registered
+        in main (see utils/error_handlers.py).
     """
     logger.debug(
         "GET /v1/test-suite/prioritization – suiteId='%s', strategy='%s'",
         testSuiteId, strategy,
     )
 
-    try:
-        response = service.prioritize_test_suite(testSuiteId, strategy)
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content=response.model_dump(mode="json"),
-        )
-
-    except TestSuiteNotFoundError as exc:
-        logger.warning("Suite not found: '%s'.", testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except StrategyNotFoundError as exc:
-        logger.warning("Unknown strategy: '%s'.", strategy)
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except PersistenceError as exc:
-        logger.exception("Persistence failure for suite '%s'.", testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except Exception as exc:
-        logger.exception("Unexpected error during prioritization of suite '%s'.", testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
+    # CPU-bound strategy + blocking DB reads: keep them off the event loop
+    response = await run_in_threadpool(service.prioritize_test_suite, testSuiteId, strategy)
+    return Response(
+        content=response.model_dump_json(),
+        status_code=status.HTTP_200_OK,
+        media_type="application/json",
+    )
 
 
 # =============================================================================
@@ -197,7 +197,7 @@ async def prioritize_test_suite(
         "Prioritizes test cases using the given strategy, simulates"
         "with a deterministic mock failure function and budget mode. "
         "Computes APFD score and stores the evaluation report. "
-        f"Available strategies: {', '.join(available_strategies())}."
+        f"Available strategies: {AVAILABLE_STRATEGIES}."
     ),
     response_model=EvaluateResponse,
     status_code=status.HTTP_201_CREATED,
@@ -211,7 +211,7 @@ async def prioritize_test_suite(
 async def evaluate_test_suite(
     body: EvaluateRequest,
     service: TestSuiteService = Depends(get_test_suite_service),
-) -> JSONResponse:
+) -> Response:
     """
     Evaluates a test suite by prioritizing test cases using a specified strategy
     and evaluation mode (budget and no budget).
@@ -223,7 +223,7 @@ async def evaluate_test_suite(
             managing and evaluating test suites.
 
     Returns:
-        JSONResponse: The HTTP response indicating the evaluation outcome or
+        Response: The HTTP response indicating the evaluation outcome or
         describing the encountered error.
 
     Raises:
@@ -232,42 +232,20 @@ async def evaluate_test_suite(
         StrategyNotFoundError: Raised if the provided strategy is unrecognized.
         PersistenceError: Raised if there is an error during the persistence
             operation.
-        Exception: Catches and logs unexpected errors, returning an internal
-            server error response.
+        Exception: Any unexpected error.
+
+        Each error is turned into its ErrorResponse by the handlers registered
+        in main (see utils/error_handlers.py).
     """
     logger.debug(
         "POST /v1/test-suite/evaluation – suiteId='%s', strategy='%s'",
         body.testSuiteId, body.strategy,
     )
 
-    try:
-        response = service.evaluate_test_suite(body)
-        return JSONResponse(
-            status_code=status.HTTP_201_CREATED,
-            content=response.model_dump(mode="json"),
-        )
-
-    except TestSuiteNotFoundError as exc:
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except StrategyNotFoundError as exc:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except PersistenceError as exc:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
-
-    except Exception as exc:
-        logger.exception("Unexpected error during evaluation of suite '%s'.", body.testSuiteId)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(message=str(exc)).model_dump(),
-        )
\ No newline at end of file
+    # CPU-bound strategy and mock + blocking DB I/O: keep them off the event loop
+    response = await run_in_threadpool(service.evaluate_test_suite, body)
+    return Response(
+        content=response.model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
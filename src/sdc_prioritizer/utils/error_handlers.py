@@ -1,18 +1,23 @@
 """Global exception handlers registered on the FastAPI application. """
 
 import logging
-from pathlib import Path
 
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
-from sdc_prioritizer.data_models.error_responses import ErrorResponse
+from sdc_prioritizer.data_models.error_responses import error_content
+from sdc_prioritizer.utils.exceptions import (
+    PersistenceError,
+    StrategyNotFoundError,
+    TestSuiteAlreadyExistsError,
+    TestSuiteNotFoundError,
+)
 
 # =============================================================================
 #   Logger
 # =============================================================================
-logger = logging.getLogger(Path(__file__).stem)
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -33,17 +38,84 @@ async def validation_exception_handler(
         JSONResponse: A JSON response object with HTTP status code 422, containing
             a message and detailed error information.
     """
-    errors = []
-    for error in exc.errors():
-        field = " → ".join(str(loc) for loc in error["loc"])
-        errors.append(f"{field}: {error['msg']}")
+    join_loc = " → ".join
+    errors = [
+        f"{join_loc(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()
+    ]
 
     logger.warning("Validation failed for %s %s: %s", request.method, request.url.path, errors)
 
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=ErrorResponse(
-            message="Validation failed. Check your request body.",
-            details=errors,
-        ).model_dump(),
-    )
\ No newline at end of file
+        content=error_content("Validation failed. Check your request body.", errors),
+    )
+
+
+# =============================================================================
+#   Domain Error Handlers
+# =============================================================================
+# Routes let domain exceptions propagate and these map them to the status code
+# and ErrorResponse body ({"message": ...}) the endpoints document.
+async def already_exists_exception_handler(
+    request: Request, exc: TestSuiteAlreadyExistsError
+) -> JSONResponse:
+    """Answer a duplicate upload with 409 Conflict."""
+    logger.warning("Conflict for %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content=error_content(str(exc)),
+    )
+
+
+# -----------------------------------------------------------------------------
+async def not_found_exception_handler(
+    request: Request, exc: TestSuiteNotFoundError
+) -> JSONResponse:
+    """Answer a request for an unknown test suite with 404 Not Found."""
+    logger.warning("Not found for %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content=error_content(str(exc)),
+    )
+
+
+# -----------------------------------------------------------------------------
+async def strategy_not_found_exception_handler(
+    request: Request, exc: StrategyNotFoundError
+) -> JSONResponse:
+    """Answer a request for an unknown prioritization strategy with 400 Bad Request."""
+    logger.warning("Unknown strategy for %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content=error_content(str(exc)),
+    )
+
+
+# -----------------------------------------------------------------------------
+async def persistence_exception_handler(
+    request: Request, exc: PersistenceError
+) -> JSONResponse:
+    """Answer a database failure with 500 Internal Server Error."""
+    logger.error(
+        "Persistence failure for %s %s.", request.method, request.url.path, exc_info=exc,
+    )
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content=error_content(str(exc)),
+    )
+
+
+# -----------------------------------------------------------------------------
+async def unexpected_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer any other error with 500 Internal Server Error.
+
+    Registered for ``Exception``, it runs in Starlette's outermost middleware,
+    which re-raises the exception to the server once the response is sent.
+    """
+    logger.error(
+        "Unexpected error for %s %s.", request.method, request.url.path, exc_info=exc,
+    )
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content=error_content(str(exc)),
+    )
@@ -1,7 +1,9 @@
+import atexit
 import logging
+import queue
 import sys
 from logging import Logger
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +21,11 @@ def setup_logging(
 ) -> None:
     """Configure root logger with a console handler and a rotating file handler.
 
+    The root logger only puts records on an in-memory queue; a background
+    ``QueueListener`` thread passes them to the two handlers, so logging calls
+    made on request paths never wait on console or disk I/O. The listener is
+    stopped, flushing what is still queued, at interpreter exit.
+
     Args:
         log_dir: Directory where log files will be written.
         log_level: Console handler log level (e.g. "INFO").
@@ -49,9 +56,18 @@ def setup_logging(
     file_handler.setLevel(logging._nameToLevel[file_log_level])
     file_handler.setFormatter(formatter)
 
-    logger.handlers = [console_handler, file_handler]
+    # Handlers run on the listener thread, each filtering on its own level
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True,
+    )
+
+    logger.handlers = [QueueHandler(log_queue)]
     logger.setLevel(logging.NOTSET)
 
+    listener.start()
+    atexit.register(listener.stop)
+
     def _handle_uncaught(exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
         if issubclass(exc_type, KeyboardInterrupt):
             sys.__excepthook__(exc_type, exc_value, exc_traceback)